@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, Response, g, jsonify, request
+
+from .config import AdmissionConfig
+
+# Lower numbers are admitted first; reads that callers use to decide what to do next
+# must keep answering while write paths are saturated.
+DEFAULT_PRIORITIES: Dict[str, int] = {
+    "health": 0,
+    "verify": 0,
+    "admission_metrics": 0,
+    # Ticket polling spikes with async redemptions at end of tenor; it must not eat the critical reserve.
+    "redeem_status": 1,
+    "intake": 1,
+    "insurance": 1,
+    "mint": 1,
+    "circulate": 1,
+    "revalue_nav": 1,
+    "anchor_affidavit_batch": 1,
+    "redeem": 2,
+    "import_affidavits": 2,
+}
+DEFAULT_PRIORITY = 1
+CRITICAL_PRIORITY = 0
+
+# Adaptive limits are re-evaluated every this many completed requests per route.
+ADAPTIVE_WINDOW = 20
+
+
+class Overloaded(Exception):
+    def __init__(self, route: str, reason: str) -> None:
+        super().__init__(f"{route}: {reason}")
+        self.route = route
+        self.reason = reason
+
+
+@dataclass(slots=True)
+class _RouteState:
+    limit: Optional[int]
+    min_limit: int = 1
+    max_limit: Optional[int] = None
+    in_flight: int = 0
+    admitted: int = 0
+    shed: int = 0
+    latency_ewma_ms: float = 0.0
+    latency_floor_ms: float = math.inf
+    samples: int = 0
+
+    def observe(self, latency_ms: float, tolerance: float) -> None:
+        """Gradient-style limit: back off when latency drifts above the best seen, else probe up."""
+
+        self.latency_ewma_ms = latency_ms if self.samples == 0 else 0.8 * self.latency_ewma_ms + 0.2 * latency_ms
+        self.latency_floor_ms = min(self.latency_floor_ms, latency_ms)
+        self.samples += 1
+        if self.limit is None or self.samples % ADAPTIVE_WINDOW:
+            return
+        if self.latency_ewma_ms > self.latency_floor_ms * tolerance:
+            self.limit = max(self.min_limit, int(self.limit * 0.9))
+        else:
+            self.limit = min(self.max_limit or self.limit + 1, self.limit + 1)
+        # Let the floor drift so a permanently slower dependency is not punished forever.
+        self.latency_floor_ms = min(self.latency_floor_ms * 1.05, self.latency_ewma_ms)
+
+
+@dataclass(slots=True)
+class _Waiter:
+    route: str
+    priority: int
+    seq: int
+    event: threading.Event = field(default_factory=threading.Event)
+    granted: bool = False
+    evicted: bool = False
+
+
+@dataclass(slots=True)
+class AdmissionTicket:
+    route: str
+    started: float
+
+
+class AdmissionController:
+    def __init__(self, config: AdmissionConfig, priorities: Optional[Dict[str, int]] = None) -> None:
+        self.config = config
+        self.priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._waiters: List[_Waiter] = []
+        self._routes: Dict[str, _RouteState] = {}
+        self._in_flight = 0
+        self._shed_total = 0
+
+    def _route(self, route: str) -> _RouteState:
+        state = self._routes.get(route)
+        if state is None:
+            limit = self.config.route_limits.get(route)
+            state = _RouteState(
+                limit=limit,
+                min_limit=max(1, (limit or 1) // 4),
+                max_limit=limit * 4 if limit and self.config.adaptive else limit,
+            )
+            self._routes[route] = state
+        return state
+
+    def _fits(self, route: str, priority: int) -> bool:
+        state = self._route(route)
+        if state.limit is not None and state.in_flight >= state.limit:
+            return False
+        global_limit = self.config.global_limit
+        if priority > CRITICAL_PRIORITY:
+            global_limit -= self.config.critical_reserve
+        return self._in_flight < global_limit
+
+    def _dispatch(self) -> None:
+        for waiter in sorted(self._waiters, key=lambda w: (w.priority, w.seq)):
+            if self._fits(waiter.route, waiter.priority):
+                self._grant(waiter)
+        self._waiters = [waiter for waiter in self._waiters if not waiter.granted]
+
+    def _grant(self, waiter: _Waiter) -> None:
+        state = self._route(waiter.route)
+        state.in_flight += 1
+        state.admitted += 1
+        self._in_flight += 1
+        waiter.granted = True
+        waiter.event.set()
+
+    def _shed(self, route: str, reason: str) -> Overloaded:
+        self._route(route).shed += 1
+        self._shed_total += 1
+        return Overloaded(route, reason)
+
+    def _evict_for(self, waiter: _Waiter) -> bool:
+        """Make room for ``waiter`` in a full queue by shedding the newest lowest-priority waiter."""
+
+        victim = max(self._waiters, key=lambda w: (w.priority, w.seq))
+        if victim is waiter:
+            return False
+        self._waiters.remove(victim)
+        self._shed(victim.route, "queue_evicted")
+        victim.evicted = True
+        victim.event.set()
+        return True
+
+    def acquire(self, route: str) -> AdmissionTicket:
+        priority = self.priorities.get(route, DEFAULT_PRIORITY)
+        waiter = _Waiter(route=route, priority=priority, seq=next(self._seq))
+
+        with self._lock:
+            self._waiters.append(waiter)
+            self._dispatch()
+            if not waiter.granted and len(self._waiters) > self.config.queue_size and not self._evict_for(waiter):
+                self._waiters.remove(waiter)
+                raise self._shed(route, "queue_full")
+
+        if not waiter.granted:
+            waiter.event.wait(self.config.queue_timeout_s)
+            with self._lock:
+                if waiter.evicted:
+                    raise Overloaded(route, "queue_evicted")
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise self._shed(route, "queue_timeout")
+
+        return AdmissionTicket(route=route, started=time.perf_counter())
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        latency_ms = (time.perf_counter() - ticket.started) * 1000
+        with self._lock:
+            state = self._route(ticket.route)
+            state.in_flight -= 1
+            self._in_flight -= 1
+            if self.config.adaptive:
+                state.observe(latency_ms, self.config.latency_tolerance)
+            self._dispatch()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "inFlight": self._in_flight,
+                "globalLimit": self.config.global_limit,
+                "queueDepth": len(self._waiters),
+                "queueSize": self.config.queue_size,
+                "shedTotal": self._shed_total,
+                "adaptive": self.config.adaptive,
+                "routes": {
+                    route: {
+                        "inFlight": state.in_flight,
+                        "limit": state.limit,
+                        "queued": sum(1 for waiter in self._waiters if waiter.route == route),
+                        "admitted": state.admitted,
+                        "shed": state.shed,
+                        "latencyEwmaMs": round(state.latency_ewma_ms, 2),
+                    }
+                    for route, state in sorted(self._routes.items())
+                },
+            }
+
+
+def _overloaded_response(exc: Overloaded, retry_after_s: int) -> Response:
+    response = jsonify({"ok": False, "error": "overloaded", "reason": exc.reason, "route": exc.route})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(retry_after_s)
+    return response
+
+
+def init_admission(app: Flask, config: AdmissionConfig, blueprint: str = "sovereign") -> AdmissionController:
+    controller = AdmissionController(config)
+    app.extensions["admission"] = controller
+
+    if not config.enabled:
+        return controller
+
+    @app.before_request
+    def admit():
+        if request.blueprint != blueprint or request.endpoint is None:
+            return None
+        route = request.endpoint.rsplit(".", 1)[-1]
+        try:
+            g.admission_ticket = controller.acquire(route)
+        except Overloaded as exc:
+            return _overloaded_response(exc, config.retry_after_s)
+        return None
+
+    @app.teardown_request
+    def release(_exception: Exception | None):
+        ticket = g.pop("admission_ticket", None)
+        if ticket is not None:
+            controller.release(ticket)
+
+    return controller
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import bindparam, insert, select, update
+
+from .config import load_affidavit_batch_config, load_config
+from .db import init_engine, session_scope
+from .merkle import affidavit_leaf, all_proofs, build_levels, split_proof, verify_proof
+from .models import Affidavit, AffidavitBatch, Asset
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists well under the bind-parameter limits of Postgres and SQLite.
+LOOKUP_CHUNK = 10_000
+
+AFFIDAVIT_FIELDS = ("externalId", "hash", "jurisdiction", "clauseRef", "issuedBy")
+
+TX_HASH_PATTERN = re.compile(r"0x[0-9a-fA-F]{64}")
+
+
+class AffidavitImportError(ValueError):
+    def __init__(self, code: str, detail: Any = None):
+        super().__init__(code)
+        self.code = code
+        self.detail = detail
+
+
+class AffidavitAnchorError(ValueError):
+    def __init__(self, code: str, detail: Any = None):
+        super().__init__(code)
+        self.code = code
+        self.detail = detail
+
+
+@dataclass(slots=True)
+class AffidavitImport:
+    inserted: int = 0
+    duplicates: int = 0
+
+
+def _chunks(values: Sequence[Any]) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        yield values[start : start + LOOKUP_CHUNK]
+
+
+def bulk_import_affidavits(session, records: Sequence[Mapping[str, Any]]) -> AffidavitImport:
+    """Bulk-insert affidavits; hashes already on file (or repeated in ``records``) are skipped.
+
+    The whole import is rejected when a record is not an object of non-empty strings or names
+    an unknown asset.
+    """
+
+    for index, record in enumerate(records):
+        if not isinstance(record, Mapping) or not all(
+            isinstance(record.get(name), str) and record[name] for name in AFFIDAVIT_FIELDS
+        ):
+            raise AffidavitImportError("missing_required_fields", {"index": index})
+
+    external_ids = sorted({str(record["externalId"]) for record in records})
+    asset_ids: Dict[str, int] = {}
+    for chunk in _chunks(external_ids):
+        asset_ids.update(
+            (external_id, asset_id)
+            for asset_id, external_id in session.query(Asset.id, Asset.external_id).filter(
+                Asset.external_id.in_(chunk)
+            )
+        )
+    unknown = [external_id for external_id in external_ids if external_id not in asset_ids]
+    if unknown:
+        raise AffidavitImportError("asset_not_found", {"externalIds": unknown})
+
+    hashes = list(dict.fromkeys(str(record["hash"]) for record in records))
+    existing = set()
+    for chunk in _chunks(hashes):
+        existing.update(value for (value,) in session.query(Affidavit.hash).filter(Affidavit.hash.in_(chunk)))
+
+    now = datetime.utcnow()
+    rows: List[Dict[str, Any]] = []
+    seen = set(existing)
+    for record in records:
+        affidavit_hash = str(record["hash"])
+        if affidavit_hash in seen:
+            continue
+        seen.add(affidavit_hash)
+        rows.append(
+            {
+                "assetId": asset_ids[str(record["externalId"])],
+                "hash": affidavit_hash,
+                "jurisdiction": record["jurisdiction"],
+                "clauseRef": record["clauseRef"],
+                "issuedBy": record["issuedBy"],
+                "createdAt": now,
+            }
+        )
+
+    # Core statements against the table: the ORM bulk path spends more time collecting
+    # per-row parameters than the database spends writing million-row imports.
+    if rows:
+        session.execute(insert(Affidavit.__table__), rows)
+    return AffidavitImport(inserted=len(rows), duplicates=len(records) - len(rows))
+
+
+def seal_batch(session, max_leaves: int) -> Optional[AffidavitBatch]:
+    """Merkle-batch up to ``max_leaves`` unbatched affidavits and store the root and every proof.
+
+    Concurrent sealers skip each other's rows, so each affidavit lands in exactly one batch.
+    """
+
+    pending = session.execute(
+        select(Affidavit.id, Affidavit.hash)
+        .where(Affidavit.batch_id.is_(None))
+        .order_by(Affidavit.id)
+        .limit(max_leaves)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not pending:
+        return None
+
+    levels = build_levels(affidavit_leaf(affidavit_hash) for _, affidavit_hash in pending)
+    batch = AffidavitBatch(root="0x" + levels[-1].hex(), leaf_count=len(pending), depth=len(levels) - 1)
+    session.add(batch)
+    session.flush()
+
+    proofs = all_proofs(levels)
+    table = Affidavit.__table__
+    session.execute(
+        update(table)
+        .where(table.c.id == bindparam("affidavit_id"))
+        .values(batchId=batch.id, leafIndex=bindparam("leaf_index"), merkleProof=bindparam("merkle_proof")),
+        [
+            {"affidavit_id": affidavit_id, "leaf_index": index, "merkle_proof": proofs[index]}
+            for index, (affidavit_id, _) in enumerate(pending)
+        ],
+    )
+    return batch
+
+
+def record_anchor(session, batch_id: int, tx_hash: Any) -> Optional[AffidavitBatch]:
+    """Record the transaction that anchored the batch root; repeating the same hash is a no-op.
+
+    A batch already anchored by a different transaction is never overwritten.
+    """
+
+    if not isinstance(tx_hash, str) or not TX_HASH_PATTERN.fullmatch(tx_hash):
+        raise AffidavitAnchorError("invalid_tx_hash")
+    tx_hash = tx_hash.lower()
+
+    batch = session.get(AffidavitBatch, batch_id, with_for_update=True)
+    if batch is None:
+        return None
+    if batch.anchor_tx_hash is not None:
+        if batch.anchor_tx_hash.lower() != tx_hash:
+            raise AffidavitAnchorError("already_anchored", {"anchorTxHash": batch.anchor_tx_hash})
+        return batch
+    batch.anchor_tx_hash = tx_hash
+    batch.anchored_at = datetime.utcnow()
+    session.flush()
+    return batch
+
+
+def inclusion_proof(affidavit: Affidavit) -> Optional[Dict[str, Any]]:
+    """Sibling path from the affidavit's leaf to its batch root, checked before it is returned."""
+
+    batch = affidavit.batch
+    if batch is None:
+        return None
+
+    leaf = affidavit_leaf(affidavit.hash)
+    packed = bytes(affidavit.merkle_proof or b"")
+    return {
+        "batchId": batch.id,
+        "root": batch.root,
+        "leaf": "0x" + leaf.hex(),
+        "leafIndex": affidavit.leaf_index,
+        "proof": ["0x" + sibling.hex() for sibling in split_proof(packed)],
+        "valid": verify_proof(leaf, packed, bytes.fromhex(batch.root[2:])),
+        "anchored": batch.anchor_tx_hash is not None,
+        "anchorTxHash": batch.anchor_tx_hash,
+        "anchoredAt": batch.anchored_at.isoformat() if batch.anchored_at else None,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seal unbatched affidavits into Merkle batches.")
+    parser.add_argument("--once", action="store_true", help="seal everything pending and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    init_engine(load_config().database_url)
+    batch_config = load_affidavit_batch_config()
+
+    while True:
+        while True:
+            started = time.perf_counter()
+            with session_scope() as session:
+                batch = seal_batch(session, batch_config.max_leaves)
+            if batch is None:
+                break
+            logger.info(
+                "Sealed affidavit batch %s: %s leaves, root %s in %.2fs",
+                batch.id,
+                batch.leaf_count,
+                batch.root,
+                time.perf_counter() - started,
+            )
+        if args.once:
+            return 0
+        time.sleep(batch_config.poll_interval_s)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,64 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Generator
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 _engine: Engine | None = None
+_database_url: str | None = None
 _session_factory: scoped_session | None = None
+# In-memory SQLite runs every session on one shared connection (and so one transaction);
+# sessions are serialized so one request's rollback cannot undo another's writes.
+_session_lock: ContextManager[Any] = nullcontext()
+
+
+def is_embedded(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def _is_in_memory(database_url: str) -> bool:
+    return make_url(database_url).database in (None, "", ":memory:")
+
+
+def _create_sqlite_engine(database_url: str) -> Engine:
+    in_memory = _is_in_memory(database_url)
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False, "timeout": 30}}
+    if in_memory:
+        # Every pooled connection to ":memory:" would be a separate empty database.
+        options["poolclass"] = StaticPool
+    engine = create_engine(database_url, future=True, **options)
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine
 
 
 def init_engine(database_url: str) -> Engine:
-    global _engine, _session_factory
+    global _engine, _database_url, _session_factory, _session_lock
+
+    if _engine is not None and database_url != _database_url:
+        dispose_engine()
 
     if _engine is None:
-        _engine = create_engine(database_url, future=True)
+        if is_embedded(database_url):
+            _engine = _create_sqlite_engine(database_url)
+            if _is_in_memory(database_url):
+                _session_lock = threading.RLock()
+        else:
+            _engine = create_engine(database_url, future=True)
+        _database_url = database_url
         _session_factory = scoped_session(
             sessionmaker(bind=_engine, autoflush=False, autocommit=False, expire_on_commit=False)
         )
@@ -23,20 +66,34 @@ def init_engine(database_url: str) -> Engine:
     return _engine
 
 
+def dispose_engine() -> None:
+    global _engine, _database_url, _session_factory, _session_lock
+
+    if _session_factory is not None:
+        _session_factory.remove()
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _database_url = None
+    _session_factory = None
+    _session_lock = nullcontext()
+
+
 @contextmanager
 def session_scope():
     if _session_factory is None:
         raise RuntimeError("Database engine not initialised. Call init_engine first.")
 
-    session = _session_factory()
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
+    with _session_lock:
+        session = _session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
 
 
 def remove_session() -> None:
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from decimal import Decimal
+
+from .models import (
+    Affidavit,
+    Asset,
+    AssetStatus,
+    AssetType,
+    FiduciaryRole,
+    InsuranceBand,
+    Issuance,
+    LedgerLog,
+    LogLevel,
+    Transaction,
+    TransactionType,
+    User,
+)
+
+FIDUCIARIES = [
+    ("law@harvest.estate", "Althea Chambers", FiduciaryRole.LAW),
+    ("cpa@harvest.estate", "Jonas Patel", FiduciaryRole.CPA),
+    ("treasury@harvest.estate", "Vera Holt", FiduciaryRole.TREASURY),
+    ("insurance@harvest.estate", "Mara Kato", FiduciaryRole.INSURANCE),
+    ("ops@harvest.estate", "Isa King", FiduciaryRole.OPS),
+    ("governance@harvest.estate", "Pax Everett", FiduciaryRole.GOVERNANCE),
+    ("oracle@harvest.estate", "Eido Relay", FiduciaryRole.ORACLE),
+]
+
+HASKINS_AFFIDAVIT_HASH = hashlib.sha256(b"Haskins Alpha Estate|2024-07-01|Matriarch|US-DE").hexdigest()
+MERIDIAN_AFFIDAVIT_HASH = hashlib.sha256(b"Meridian Beta IP Trust|2024-07-01|Matriarch|US-CA").hexdigest()
+
+
+def seed_fixtures(session) -> bool:
+    """Load the se7en demo estate (seed_demo_data.ts) into an empty database.
+
+    Returns False without writing anything when fiduciary users already exist.
+    """
+
+    if session.query(User.id).first() is not None:
+        return False
+
+    users = {
+        role: User(email=email, display_name=display_name, role=role)
+        for email, display_name, role in FIDUCIARIES
+    }
+    session.add_all(users.values())
+
+    haskins = Asset(
+        external_id="HAS-ALPHA",
+        name="Haskins Alpha Estate",
+        asset_type=AssetType.CSDN,
+        jurisdiction="US-DE-TRUST",
+        valuation_usd=Decimal("875000"),
+        status=AssetStatus.CIRCULATING,
+    )
+    meridian = Asset(
+        external_id="MER-BETA",
+        name="Meridian Beta IP Trust",
+        asset_type=AssetType.SDN,
+        jurisdiction="US-CA-IP",
+        valuation_usd=Decimal("620000"),
+        status=AssetStatus.INSURED,
+    )
+    haskins.insurance.append(
+        InsuranceBand(
+            provider="Matriarch",
+            multiplier=Decimal("3.5"),
+            coverage_usd=Decimal("3062500"),
+            policy_json=json.dumps(
+                {"jurisdiction": "US-DE", "multiplier": "3.5x", "coverageCurrency": "USD", "floor": 0.85}
+            ),
+        )
+    )
+    meridian.insurance.append(
+        InsuranceBand(
+            provider="Matriarch",
+            multiplier=Decimal("2.8"),
+            coverage_usd=Decimal("1736000"),
+            policy_json=json.dumps(
+                {"jurisdiction": "US-CA", "multiplier": "2.8x", "coverageCurrency": "USD", "floor": 0.8}
+            ),
+        )
+    )
+
+    haskins_issuance = Issuance(
+        token_symbol="HRVST",
+        quantity=Decimal("380038.75"),
+        nav_per_token=Decimal("0.91"),
+        policy_floor=Decimal("0.85"),
+        tx_hash="0xHASKINSINTAKE",
+    )
+    haskins.issuances.append(haskins_issuance)
+    meridian.issuances.append(
+        Issuance(
+            token_symbol="HRVST",
+            quantity=Decimal("248000.00"),
+            nav_per_token=Decimal("0.88"),
+            policy_floor=Decimal("0.80"),
+            tx_hash="0xMERIDIANINTAKE",
+        )
+    )
+
+    haskins.affidavits.append(
+        Affidavit(
+            hash=HASKINS_AFFIDAVIT_HASH,
+            jurisdiction="US-DE",
+            clause_ref="EYEION-2024-ALPHA",
+            issued_by="Eyeion Legal Chain",
+        )
+    )
+    meridian.affidavits.append(
+        Affidavit(
+            hash=MERIDIAN_AFFIDAVIT_HASH,
+            jurisdiction="US-CA",
+            clause_ref="EYEION-2024-BETA",
+            issued_by="Eyeion Legal Chain",
+        )
+    )
+
+    for tx_type, amount_usd, metadata in [
+        (TransactionType.INTAKE, "875000", {"step": "Intake", "actor": "Se7en"}),
+        (TransactionType.INSURANCE_PREMIUM, "0", {"step": "Insurance", "multiplier": "3.5x", "provider": "Matriarch"}),
+        (TransactionType.MINT, "380038.75", {"step": "Issuance", "txHash": "0xHASKINSINTAKE"}),
+        (TransactionType.CIRCULATION, "360000", {"step": "Circulation", "desk": "Kiiantu", "tenorDays": 90}),
+    ]:
+        haskins.transactions.append(
+            Transaction(
+                issuance=haskins_issuance,
+                type=tx_type,
+                amount_usd=Decimal(amount_usd),
+                metadata_payload=metadata,
+            )
+        )
+
+    session.add_all([haskins, meridian])
+    session.add(
+        LedgerLog(
+            scope="workflow:has-alpha",
+            level=LogLevel.INFO,
+            message="Demo estate seeded",
+            metadata_payload={"assets": ["HAS-ALPHA", "MER-BETA"]},
+            user=users[FiduciaryRole.OPS],
+        )
+    )
+    session.flush()
+    return True
@@ -0,0 +1,568 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from eth_abi import decode as abi_decode
+from eth_abi.exceptions import DecodingError
+from eth_abi.grammar import parse as parse_abi_type
+from sqlalchemy import delete, insert
+from web3 import Web3
+
+from .config import IndexerConfig, load_config, load_indexer_config
+from .db import init_engine, session_scope
+from .models import Asset, IndexerCursor, LedgerLog, LogLevel, Transaction, TransactionType
+
+logger = logging.getLogger(__name__)
+
+CURSOR_NAME = "chain_indexer"
+CHAIN_SCOPE_PREFIX = "chain:"
+WEI = Decimal(10) ** 18
+
+# Committed (block, hash) pairs kept on the cursor so reorg recovery can find a canonical
+# block without walking the ledger when events are sparse.
+CHECKPOINT_HISTORY = 64
+
+# Grow the window while responses stay under this many logs, shrink above it.
+TARGET_LOGS_PER_WINDOW = 2_000
+
+
+def _event(name: str, *inputs: Tuple[str, str, bool]) -> Dict[str, Any]:
+    return {
+        "type": "event",
+        "name": name,
+        "anonymous": False,
+        "inputs": [{"name": arg, "type": kind, "indexed": indexed} for arg, kind, indexed in inputs],
+    }
+
+
+MODULE_EVENTS: Dict[str, List[Dict[str, Any]]] = {
+    "eklesia": [
+        _event(
+            "Attested",
+            ("attestationId", "bytes32", True),
+            ("subjectId", "bytes32", True),
+            ("payloadHash", "bytes32", False),
+            ("jurisdiction", "string", False),
+            ("clause", "string", False),
+            ("timestamp", "uint256", False),
+            ("attestor", "address", True),
+        ),
+    ],
+    "eyeion": [
+        _event(
+            "AffidavitCreated",
+            ("affidavitId", "bytes32", True),
+            ("assetId", "bytes32", True),
+            ("documentHash", "bytes32", False),
+            ("witness", "address", True),
+            ("timestamp", "uint256", False),
+        ),
+    ],
+    "safevault": [
+        _event(
+            "CustodyUpdated",
+            ("assetId", "bytes32", True),
+            ("custody", "bool", False),
+            ("timestamp", "uint256", False),
+            ("actor", "address", True),
+        ),
+        _event(
+            "DocumentStored",
+            ("assetId", "bytes32", True),
+            ("docHash", "bytes32", True),
+            ("actor", "address", True),
+        ),
+    ],
+    "vaultquant": [
+        _event("AssetNavSet", ("assetId", "bytes32", True), ("nav", "uint256", False), ("actor", "address", True)),
+        _event(
+            "InstrumentIssued",
+            ("noteId", "uint256", True),
+            ("assetId", "bytes32", True),
+            ("instrumentType", "uint8", False),
+            ("par", "uint256", False),
+            ("nav", "uint256", False),
+            ("affidavitId", "bytes32", False),
+        ),
+        _event(
+            "InstrumentRedeemed",
+            ("noteId", "uint256", True),
+            ("amount", "uint256", False),
+            ("remainingNav", "uint256", False),
+        ),
+        _event("NoteNavUpdated", ("noteId", "uint256", True), ("updatedNav", "uint256", False)),
+    ],
+    "matriarch": [
+        _event(
+            "CoverageBound",
+            ("binderId", "bytes32", True),
+            ("assetId", "bytes32", True),
+            ("classCode", "uint8", False),
+            ("factorBps", "uint256", False),
+            ("underwriter", "address", True),
+        ),
+        _event("BandsDisclosureAnchored", ("disclosureHash", "bytes32", True), ("timestamp", "uint256", False)),
+    ],
+    "kiiantu": [
+        _event(
+            "CycleExecuted",
+            ("cycleId", "bytes32", True),
+            ("noteId", "uint256", True),
+            ("tenorDays", "uint16", False),
+            ("rateBps", "uint16", False),
+            ("timestamp", "uint256", False),
+            ("operator", "address", True),
+        ),
+    ],
+    "hrvst": [
+        _event(
+            "MintByNAV",
+            ("to", "address", True),
+            ("amount", "uint256", False),
+            ("navCsdn", "uint256", False),
+            ("navSdn", "uint256", False),
+            ("floorBps", "uint256", False),
+        ),
+    ],
+}
+
+# Events that move value are mirrored as Transaction rows: (type, wei amount field).
+TRANSACTION_EVENTS: Dict[str, Tuple[TransactionType, Optional[str]]] = {
+    "vaultquant:AssetNavSet": (TransactionType.NAV_UPDATE, "nav"),
+    "vaultquant:NoteNavUpdated": (TransactionType.NAV_UPDATE, "updatedNav"),
+    "vaultquant:InstrumentIssued": (TransactionType.MINT, "par"),
+    "vaultquant:InstrumentRedeemed": (TransactionType.REDEMPTION, "amount"),
+    "hrvst:MintByNAV": (TransactionType.MINT, "amount"),
+    "kiiantu:CycleExecuted": (TransactionType.CIRCULATION, None),
+}
+
+
+@dataclass(slots=True)
+class DecodedEvent:
+    event_uid: str
+    module: str
+    kind: str
+    block_number: int
+    block_hash: str
+    tx_hash: str
+    payload: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class IndexerStats:
+    from_block: int = 0
+    to_block: int = -1
+    logs: int = 0
+    events: int = 0
+    windows: int = 0
+    splits: int = 0
+    reorgs: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def blocks(self) -> int:
+        return max(0, self.to_block - self.from_block + 1)
+
+    @property
+    def blocks_per_second(self) -> float:
+        return self.blocks / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fromBlock": self.from_block,
+            "toBlock": self.to_block,
+            "blocks": self.blocks,
+            "logs": self.logs,
+            "events": self.events,
+            "windows": self.windows,
+            "splits": self.splits,
+            "reorgs": self.reorgs,
+            "elapsedS": round(self.elapsed_s, 3),
+            "blocksPerSecond": round(self.blocks_per_second, 1),
+        }
+
+
+@dataclass(slots=True)
+class RangeSizer:
+    """Adapts the eth_getLogs window to the log density seen on chain."""
+
+    size: int
+    minimum: int
+    maximum: int
+    target_logs: int = TARGET_LOGS_PER_WINDOW
+
+    def record(self, log_count: int) -> None:
+        if log_count > self.target_logs:
+            self.shrink()
+        elif log_count < self.target_logs // 2:
+            self.size = min(self.maximum, self.size * 2)
+
+    def shrink(self) -> None:
+        self.size = max(self.minimum, self.size // 2)
+
+    def plan(self, start: int, end: int, count: int) -> List[Tuple[int, int]]:
+        windows: List[Tuple[int, int]] = []
+        while start <= end and len(windows) < count:
+            stop = min(end, start + self.size - 1)
+            windows.append((start, stop))
+            start = stop + 1
+        return windows
+
+
+@dataclass(slots=True)
+class _WindowResult:
+    logs: List[Any] = field(default_factory=list)
+    splits: int = 0
+    events: List[DecodedEvent] = field(default_factory=list)
+
+
+def _hex(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return Web3.to_hex(value)
+    return str(value)
+
+
+def _raw(value: Any) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(str(value).removeprefix("0x"))
+
+
+@lru_cache(maxsize=4_096)
+def _checksum(address: str) -> str:
+    return Web3.to_checksum_address(address)
+
+
+@dataclass(frozen=True, slots=True)
+class _EventDecoder:
+    """Decodes one event's topics and data with ``eth_abi`` types worked out once from the ABI.
+
+    Produces the same args as web3's ``process_log`` (indexed args first, checksummed
+    addresses) without its per-log ABI walk, which dominated backfill time.
+    """
+
+    name: str
+    topic_names: Tuple[str, ...]
+    topic_types: Tuple[str, ...]
+    data_names: Tuple[str, ...]
+    data_types: Tuple[str, ...]
+
+    @classmethod
+    def from_abi(cls, abi_event: Dict[str, Any]) -> "_EventDecoder":
+        indexed = [arg for arg in abi_event["inputs"] if arg["indexed"]]
+        data = [arg for arg in abi_event["inputs"] if not arg["indexed"]]
+        return cls(
+            name=abi_event["name"],
+            topic_names=tuple(arg["name"] for arg in indexed),
+            # Indexed dynamic values are stored as their keccak hash, one word per topic.
+            topic_types=tuple("bytes32" if parse_abi_type(arg["type"]).is_dynamic else arg["type"] for arg in indexed),
+            data_names=tuple(arg["name"] for arg in data),
+            data_types=tuple(arg["type"] for arg in data),
+        )
+
+    def decode(self, topics: Sequence[Any], data: Any) -> Optional[Dict[str, Any]]:
+        if len(topics) != len(self.topic_types) + 1:
+            return None
+        try:
+            indexed = abi_decode(self.topic_types, b"".join(_raw(topic) for topic in topics[1:]))
+            values = abi_decode(self.data_types, _raw(data))
+        except (DecodingError, ValueError):
+            return None
+        args = zip(self.topic_names + self.data_names, self.topic_types + self.data_types, indexed + values)
+        return {name: _checksum(value) if kind == "address" else value for name, kind, value in args}
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return Web3.to_hex(value)
+    return value
+
+
+class ChainIndexer:
+    def __init__(
+        self,
+        config: IndexerConfig,
+        w3: Optional[Web3] = None,
+        cursor_name: str = CURSOR_NAME,
+        get_logs: Optional[Callable[[Dict[str, Any]], Sequence[Any]]] = None,
+    ) -> None:
+        self.config = config
+        self.w3 = w3 or Web3(Web3.HTTPProvider(config.rpc_url, request_kwargs={"timeout": 60}))
+        self.cursor_name = cursor_name
+        self.sizer = RangeSizer(
+            size=config.range_size,
+            minimum=max(1, config.min_range),
+            maximum=max(config.range_size, config.max_range),
+        )
+        self._get_logs = get_logs or self.w3.eth.get_logs
+        self._addresses = [Web3.to_checksum_address(address) for address in config.addresses.values()]
+        self._module_by_address = {
+            address.lower(): module for module, address in config.addresses.items()
+        }
+        self._events_by_topic: Dict[str, _EventDecoder] = {}
+        for module, abi_events in MODULE_EVENTS.items():
+            for abi_event in abi_events:
+                signature = f"{abi_event['name']}({','.join(arg['type'] for arg in abi_event['inputs'])})"
+                topic = Web3.to_hex(Web3.keccak(text=signature))
+                self._events_by_topic[f"{module}:{topic}"] = _EventDecoder.from_abi(abi_event)
+
+    def _load_cursor(self) -> Tuple[int, Optional[str]]:
+        with session_scope() as session:
+            cursor = session.get(IndexerCursor, self.cursor_name)
+            if cursor is None:
+                cursor = IndexerCursor(name=self.cursor_name, last_block=self.config.start_block - 1)
+                session.add(cursor)
+                session.flush()
+            return int(cursor.last_block), cursor.last_block_hash
+
+    def _block_hash(self, block_number: int) -> str:
+        return _hex(self.w3.eth.get_block(block_number)["hash"])
+
+    def _canonical_ancestor(self, last_block: int, checkpoints: Sequence[Sequence[Any]]) -> Tuple[int, Optional[str]]:
+        """Newest indexed block at or below ``last_block`` whose stored hash the chain still agrees with.
+
+        Candidates are the cursor's recent checkpoints and the ``blockHash`` recorded on every
+        indexed ledger row, newest first; a matching block proves everything below it canonical.
+        """
+
+        block_number = LedgerLog.chain_block.label("block_number")
+        block_hash = LedgerLog.metadata_payload["blockHash"].as_string().label("block_hash")
+        with session_scope() as session:
+            indexed = (
+                session.query(block_number, block_hash)
+                .filter(LedgerLog.chain_block <= last_block)
+                .distinct()
+                .order_by(block_number.desc())
+                .yield_per(1_000)
+            )
+            recent = sorted(((int(number), str(value)) for number, value in checkpoints), reverse=True)
+            checked = set()
+            for number, expected in heapq.merge(recent, indexed, key=lambda entry: -entry[0]):
+                if number < self.config.start_block or number > last_block:
+                    continue
+                if (number, expected) in checked:
+                    continue
+                checked.add((number, expected))
+                if self._block_hash(number) == expected:
+                    return number, expected
+
+        start = self.config.start_block
+        return start - 1, self._block_hash(start - 1) if start > 0 else None
+
+    def check_reorg(self) -> bool:
+        """Rewind the cursor to the newest block still on the canonical chain when its hash no longer matches."""
+
+        last_block, last_hash = self._load_cursor()
+        if last_hash is None or last_block < self.config.start_block:
+            return False
+        if self._block_hash(last_block) == last_hash:
+            return False
+
+        with session_scope() as session:
+            checkpoints = list(session.get(IndexerCursor, self.cursor_name).recent_blocks or [])
+        rewind_to, rewind_hash = self._canonical_ancestor(last_block - 1, checkpoints)
+        logger.warning(
+            "Chain reorg detected at block %s; rewinding indexer cursor to %s", last_block, rewind_to
+        )
+        with session_scope() as session:
+            # chainBlock is only set on indexer rows and is indexed, unlike the JSON metadata.
+            session.execute(delete(LedgerLog).where(LedgerLog.chain_block > rewind_to))
+            session.execute(delete(Transaction).where(Transaction.chain_block > rewind_to))
+            cursor = session.get(IndexerCursor, self.cursor_name)
+            cursor.last_block = rewind_to
+            cursor.last_block_hash = rewind_hash
+            cursor.recent_blocks = [entry for entry in checkpoints if int(entry[0]) <= rewind_to]
+        return True
+
+    def _fetch_and_decode(self, window: Tuple[int, int]) -> _WindowResult:
+        # Runs on the pool, so one window decodes while the others are still waiting on the node.
+        result = self._fetch_window(window)
+        result.events = [event for event in map(self.decode, result.logs) if event is not None]
+        return result
+
+    def _fetch_window(self, window: Tuple[int, int]) -> _WindowResult:
+        start, end = window
+        try:
+            logs = self._get_logs({"address": self._addresses, "fromBlock": start, "toBlock": end})
+            return _WindowResult(logs=list(logs))
+        except (ValueError, requests.RequestException) as exc:
+            if end - start + 1 <= self.sizer.minimum:
+                raise
+            logger.debug("eth_getLogs %s-%s failed (%s); splitting window", start, end, exc)
+            middle = start + (end - start) // 2
+            left = self._fetch_window((start, middle))
+            right = self._fetch_window((middle + 1, end))
+            return _WindowResult(logs=left.logs + right.logs, splits=1 + left.splits + right.splits)
+
+    def decode(self, log: Any) -> Optional[DecodedEvent]:
+        topics = log.get("topics") or []
+        module = self._module_by_address.get(str(log["address"]).lower())
+        if not topics or module is None:
+            return None
+        decoder = self._events_by_topic.get(f"{module}:{_hex(topics[0])}")
+        if decoder is None:
+            return None
+        args = decoder.decode(topics, log.get("data", b""))
+        if args is None:
+            return None
+
+        tx_hash = _hex(log["transactionHash"])
+        return DecodedEvent(
+            event_uid=f"{tx_hash}:{int(log['logIndex'])}",
+            module=module,
+            kind=decoder.name,
+            block_number=int(log["blockNumber"]),
+            block_hash=_hex(log["blockHash"]),
+            tx_hash=tx_hash,
+            payload={key: _serialize(value) for key, value in args.items()},
+        )
+
+    def _asset_ids(self, session) -> Dict[str, int]:
+        return {
+            Web3.to_hex(Web3.keccak(text=external_id)): asset_id
+            for asset_id, external_id in session.query(Asset.id, Asset.external_id)
+        }
+
+    def build_rows(
+        self, events: Sequence[DecodedEvent], asset_ids: Dict[str, int]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        ledger_rows: List[Dict[str, Any]] = []
+        transaction_rows: List[Dict[str, Any]] = []
+
+        for event in events:
+            metadata = {
+                "source": "chain",
+                "eventUid": event.event_uid,
+                "module": event.module,
+                "kind": event.kind,
+                "txHash": event.tx_hash,
+                "blockNumber": event.block_number,
+                "blockHash": event.block_hash,
+                "payload": event.payload,
+            }
+            ledger_rows.append(
+                {
+                    "scope": f"{CHAIN_SCOPE_PREFIX}{event.module}",
+                    "level": LogLevel.INFO,
+                    "message": f"{event.kind} indexed at block {event.block_number}",
+                    "metadata_payload": metadata,
+                    "chain_block": event.block_number,
+                }
+            )
+
+            mapping = TRANSACTION_EVENTS.get(f"{event.module}:{event.kind}")
+            if mapping is None:
+                continue
+            tx_type, amount_field = mapping
+            amount = Decimal(event.payload[amount_field]) / WEI if amount_field else Decimal("0")
+            transaction_rows.append(
+                {
+                    "asset_id": asset_ids.get(str(event.payload.get("assetId", "")).lower()),
+                    "type": tx_type,
+                    "amount_usd": amount,
+                    "metadata_payload": metadata,
+                    "chain_block": event.block_number,
+                }
+            )
+
+        return ledger_rows, transaction_rows
+
+    def _commit(self, events: Sequence[DecodedEvent], end_block: int, end_hash: str) -> int:
+        with session_scope() as session:
+            if events:
+                ledger_rows, transaction_rows = self.build_rows(events, self._asset_ids(session))
+                session.execute(insert(LedgerLog), ledger_rows)
+                if transaction_rows:
+                    session.execute(insert(Transaction), transaction_rows)
+
+            cursor = session.get(IndexerCursor, self.cursor_name)
+            cursor.last_block = end_block
+            cursor.last_block_hash = end_hash
+            cursor.recent_blocks = [*(cursor.recent_blocks or []), [end_block, end_hash]][-CHECKPOINT_HISTORY:]
+        return len(events)
+
+    def safe_head(self) -> int:
+        return self.w3.eth.block_number - self.config.confirmations
+
+    def backfill(self, to_block: Optional[int] = None) -> IndexerStats:
+        """Index every confirmed block after the cursor, up to ``to_block`` (default: safe head)."""
+
+        started = time.perf_counter()
+        last_block, _ = self._load_cursor()
+        target = self.safe_head() if to_block is None else min(to_block, self.safe_head())
+        stats = IndexerStats(from_block=last_block + 1, to_block=last_block)
+
+        if not self._addresses:
+            logger.warning("Chain indexer has no contract addresses configured; nothing to index.")
+            return stats
+
+        concurrency = max(1, self.config.concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="indexer") as pool:
+            next_block = last_block + 1
+            while next_block <= target:
+                windows = self.sizer.plan(next_block, target, concurrency)
+                results = list(pool.map(self._fetch_and_decode, windows))
+
+                events: List[DecodedEvent] = []
+                for result in results:
+                    events.extend(result.events)
+                    stats.logs += len(result.logs)
+                    stats.splits += result.splits
+                    if result.splits:
+                        self.sizer.shrink()
+                    else:
+                        self.sizer.record(len(result.logs))
+
+                end_block = windows[-1][1]
+                stats.events += self._commit(events, end_block, self._block_hash(end_block))
+                stats.windows += len(windows)
+                stats.to_block = end_block
+                next_block = end_block + 1
+
+        stats.elapsed_s = time.perf_counter() - started
+        return stats
+
+    def run_once(self, to_block: Optional[int] = None) -> IndexerStats:
+        reorged = self.check_reorg()
+        stats = self.backfill(to_block)
+        stats.reorgs = int(reorged)
+        return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Index sovereign contract events into the gateway ledger.")
+    parser.add_argument("--once", action="store_true", help="backfill to the safe head and exit")
+    parser.add_argument("--to-block", type=int, default=None, help="stop after this block (implies --once)")
+    parser.add_argument("--cursor", default=CURSOR_NAME, help="cursor name, use a fresh one for benchmarks")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    init_engine(load_config().database_url)
+    indexer_config = load_indexer_config()
+    indexer = ChainIndexer(indexer_config, cursor_name=args.cursor)
+
+    while True:
+        stats = indexer.run_once(args.to_block)
+        if stats.blocks:
+            logger.info("Chain indexer progress %s", stats.as_dict())
+        if args.once or args.to_block is not None:
+            return 0
+        time.sleep(indexer_config.poll_interval_s)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,23 +2,38 @@ from __future__ import annotations
 
 from flask import Flask
 
-from .config import load_config
-from .db import init_engine, remove_session
+from .admission import init_admission
+from .config import Config, load_admission_config, load_config
+from .db import init_engine, is_embedded, remove_session, session_scope
+from .fixtures import seed_fixtures
+from .models import Base
 from .routes import bp as sovereign_bp
 
 
-def create_app() -> Flask:
+def create_app(config: Config | None = None) -> Flask:
+    """Build the gateway; a ``sqlite://`` DATABASE_URL runs it on an embedded database.
+
+    Postgres schemas are owned by the Prisma migrations. The embedded database is
+    created from the models on startup, and ``DATABASE_SEED`` loads the demo estate.
+    """
+
     app = Flask(__name__)
 
-    config = load_config()
+    config = config or load_config()
     app.config["ESTATE_CONFIG"] = config
 
-    init_engine(config.database_url)
+    engine = init_engine(config.database_url)
+    if is_embedded(config.database_url):
+        Base.metadata.create_all(engine)
+    if config.database_seed:
+        with session_scope() as session:
+            seed_fixtures(session)
 
     @app.teardown_appcontext
     def cleanup(_exception: Exception | None):
         remove_session()
 
+    init_admission(app, load_admission_config(), blueprint=sovereign_bp.name)
     app.register_blueprint(sovereign_bp)
 
     return app
@@ -0,0 +1,110 @@
+"""Keccak Merkle trees for affidavit batches.
+
+Pairs are hashed in sorted order (``keccak256(min(a, b) ++ max(a, b))``) and a node without a
+sibling is promoted unchanged, so proofs are plain sibling lists that OpenZeppelin's
+``MerkleProof.verify`` accepts on-chain. Leaves are ``keccak256`` of the 32-byte affidavit hash.
+
+Each level is held as one contiguous ``bytes`` buffer of 32-byte nodes, leaves first and root
+last, so a 1M-leaf tree is ~64 MB of buffers rather than millions of node objects.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence
+
+try:
+    # safe-pysha3 hashes 64-byte nodes ~5x faster per call than pycryptodome's keccak.
+    from sha3 import keccak_256 as _keccak_256
+except ImportError:  # pragma: no cover - depends on the installed wheels
+    from Crypto.Hash import keccak as _keccak
+
+    def _keccak_256(data: bytes = b""):
+        return _keccak.new(data=data, digest_bits=256)
+
+
+NODE_SIZE = 32
+
+
+def keccak256(data: bytes) -> bytes:
+    return _keccak_256(data).digest()
+
+
+def affidavit_leaf(affidavit_hash: str) -> bytes:
+    """Leaf for an affidavit hash: hex digests hash as raw bytes, anything else as UTF-8."""
+
+    value = affidavit_hash[2:] if affidavit_hash.startswith("0x") else affidavit_hash
+    try:
+        raw = bytes.fromhex(value)
+    except ValueError:
+        raw = affidavit_hash.encode("utf-8")
+    if len(raw) != NODE_SIZE:
+        raw = affidavit_hash.encode("utf-8")
+    return keccak256(raw)
+
+
+def build_levels(leaves: Iterable[bytes]) -> List[bytes]:
+    """Hash the tree bottom-up; returns every level as a buffer, ``levels[-1]`` is the root."""
+
+    level = b"".join(leaves)
+    if not level or len(level) % NODE_SIZE:
+        raise ValueError("merkle_leaves_invalid")
+
+    new = _keccak_256
+    levels = [level]
+    while len(level) > NODE_SIZE:
+        count = len(level) // NODE_SIZE
+        paired = (count // 2) * 2 * NODE_SIZE
+        parents = bytearray()
+        append = parents.extend
+        for offset in range(0, paired, 2 * NODE_SIZE):
+            left = level[offset : offset + NODE_SIZE]
+            right = level[offset + NODE_SIZE : offset + 2 * NODE_SIZE]
+            append(new(left + right if left <= right else right + left).digest())
+        if count % 2:
+            append(level[paired:])
+        level = bytes(parents)
+        levels.append(level)
+    return levels
+
+
+def root(levels: Sequence[bytes]) -> bytes:
+    return levels[-1]
+
+
+def proof(levels: Sequence[bytes], index: int) -> bytes:
+    """Concatenated siblings for one leaf, leaf level first; O(log n) slices."""
+
+    siblings = bytearray()
+    for level in levels[:-1]:
+        sibling = (index ^ 1) * NODE_SIZE
+        if sibling < len(level):
+            siblings += level[sibling : sibling + NODE_SIZE]
+        index >>= 1
+    return bytes(siblings)
+
+
+def all_proofs(levels: Sequence[bytes]) -> List[bytes]:
+    """Proofs for every leaf, built top-down so siblings shared by a subtree are sliced once."""
+
+    proofs = [b""]
+    for level in reversed(levels[:-1]):
+        count = len(level) // NODE_SIZE
+        below: List[bytes] = []
+        append = below.append
+        for index in range(count):
+            sibling = (index ^ 1) * NODE_SIZE
+            parent = proofs[index >> 1]
+            append(level[sibling : sibling + NODE_SIZE] + parent if sibling < len(level) else parent)
+        proofs = below
+    return proofs
+
+
+def split_proof(packed: bytes) -> List[bytes]:
+    return [packed[offset : offset + NODE_SIZE] for offset in range(0, len(packed), NODE_SIZE)]
+
+
+def verify_proof(leaf: bytes, packed_proof: bytes, expected_root: bytes) -> bool:
+    node = leaf
+    for sibling in split_proof(packed_proof):
+        node = keccak256(node + sibling if node <= sibling else sibling + node)
+    return node == expected_root
@@ -5,20 +5,34 @@ from decimal import Decimal
 from enum import Enum
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     DateTime,
     Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
+    JSON,
+    LargeBinary,
     Numeric,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+# JSONB on Postgres (matching the Prisma migrations), plain JSON text in embedded SQLite mode.
+JSONPayload = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _chain_block_index(name: str) -> Index:
+    # Only rows written by the chain indexer carry a block number, so the index stays small.
+    where = text('"chainBlock" IS NOT NULL')
+    return Index(name, "chainBlock", postgresql_where=where, sqlite_where=where)
+
 
 class AssetType(str, Enum):
     CSDN = "CSDN"
@@ -58,6 +72,14 @@ class UserStatus(str, Enum):
     INACTIVE = "INACTIVE"
 
 
+class RedemptionJobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    PROCESSING = "PROCESSING"
+    COMPLETED = "COMPLETED"
+    REJECTED = "REJECTED"
+    FAILED = "FAILED"
+
+
 class LogLevel(str, Enum):
     INFO = "INFO"
     WARN = "WARN"
@@ -68,7 +90,7 @@ class Asset(Base):
     __tablename__ = "Asset"
 
     id = Column(Integer, primary_key=True)
-    external_id = Column(String, unique=True, nullable=False)
+    external_id = Column("externalId", String, unique=True, nullable=False)
     name = Column(String, nullable=False)
     asset_type = Column("assetType", SAEnum(AssetType, name="AssetType"), nullable=False)
     jurisdiction = Column(String, nullable=False)
@@ -85,6 +107,10 @@ class Asset(Base):
 
 class Issuance(Base):
     __tablename__ = "Issuance"
+    __table_args__ = (
+        Index("Issuance_assetId_tokenSymbol_key", "assetId", "tokenSymbol", unique=True),
+        Index("Issuance_assetId_createdAt_idx", "assetId", "createdAt"),
+    )
 
     id = Column(Integer, primary_key=True)
     asset_id = Column("assetId", ForeignKey("Asset.id"), nullable=False)
@@ -102,6 +128,7 @@ class Issuance(Base):
 
 class InsuranceBand(Base):
     __tablename__ = "InsuranceBand"
+    __table_args__ = (Index("InsuranceBand_assetId_provider_key", "assetId", "provider", unique=True),)
 
     id = Column(Integer, primary_key=True)
     asset_id = Column("assetId", ForeignKey("Asset.id"), nullable=False)
@@ -117,15 +144,21 @@ class InsuranceBand(Base):
 
 class Transaction(Base):
     __tablename__ = "Transaction"
+    __table_args__ = (
+        Index("Transaction_assetId_occurredAt_idx", "assetId", "occurredAt"),
+        Index("Transaction_issuanceId_idx", "issuanceId"),
+        _chain_block_index("Transaction_chainBlock_idx"),
+    )
 
     id = Column(Integer, primary_key=True)
     asset_id = Column("assetId", ForeignKey("Asset.id"), nullable=True)
     issuance_id = Column("issuanceId", ForeignKey("Issuance.id"), nullable=True)
     type = Column(SAEnum(TransactionType, name="TransactionType"), nullable=False)
     amount_usd = Column("amountUsd", Numeric(asdecimal=True), nullable=False, default=Decimal("0"))
-    metadata_payload = Column("metadata", JSONB, nullable=True)
+    metadata_payload = Column("metadata", JSONPayload, nullable=True)
     occurred_at = Column("occurredAt", DateTime, default=datetime.utcnow, nullable=False)
     created_at = Column("createdAt", DateTime, default=datetime.utcnow, nullable=False)
+    chain_block = Column("chainBlock", BigInteger, nullable=True)
 
     asset = relationship("Asset", back_populates="transactions")
     issuance = relationship("Issuance", back_populates="transactions")
@@ -133,6 +166,10 @@ class Transaction(Base):
 
 class Affidavit(Base):
     __tablename__ = "Affidavit"
+    __table_args__ = (
+        Index("Affidavit_assetId_idx", "assetId"),
+        Index("Affidavit_batchId_id_idx", "batchId", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     asset_id = Column("assetId", ForeignKey("Asset.id"), nullable=False)
@@ -140,13 +177,32 @@ class Affidavit(Base):
     jurisdiction = Column(String, nullable=False)
     clause_ref = Column("clauseRef", String, nullable=False)
     issued_by = Column("issuedBy", String, nullable=False)
+    batch_id = Column("batchId", ForeignKey("AffidavitBatch.id"), nullable=True)
+    leaf_index = Column("leafIndex", Integer, nullable=True)
+    merkle_proof = Column("merkleProof", LargeBinary, nullable=True)
     created_at = Column("createdAt", DateTime, default=datetime.utcnow, nullable=False)
 
     asset = relationship("Asset", back_populates="affidavits")
+    batch = relationship("AffidavitBatch", back_populates="affidavits")
+
+
+class AffidavitBatch(Base):
+    __tablename__ = "AffidavitBatch"
+
+    id = Column(Integer, primary_key=True)
+    root = Column(String, unique=True, nullable=False)
+    leaf_count = Column("leafCount", Integer, nullable=False)
+    depth = Column(Integer, nullable=False)
+    anchor_tx_hash = Column("anchorTxHash", String, nullable=True)
+    anchored_at = Column("anchoredAt", DateTime, nullable=True)
+    created_at = Column("createdAt", DateTime, default=datetime.utcnow, nullable=False)
+
+    affidavits = relationship("Affidavit", back_populates="batch")
 
 
 class User(Base):
     __tablename__ = "User"
+    __table_args__ = (Index("User_role_idx", "role"),)
 
     id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, nullable=False)
@@ -161,13 +217,62 @@ class User(Base):
 
 class LedgerLog(Base):
     __tablename__ = "LedgerLog"
+    __table_args__ = (
+        Index("LedgerLog_scope_createdAt_idx", "scope", "createdAt"),
+        Index("LedgerLog_userId_idx", "userId"),
+        _chain_block_index("LedgerLog_chainBlock_idx"),
+    )
 
     id = Column(Integer, primary_key=True)
     scope = Column(String, nullable=False)
     level = Column(SAEnum(LogLevel, name="LogLevel"), nullable=False, default=LogLevel.INFO)
     message = Column(String, nullable=False)
-    metadata_payload = Column("metadata", JSONB, nullable=True)
+    metadata_payload = Column("metadata", JSONPayload, nullable=True)
     created_at = Column("createdAt", DateTime, default=datetime.utcnow, nullable=False)
     user_id = Column("userId", ForeignKey("User.id"), nullable=True)
+    chain_block = Column("chainBlock", BigInteger, nullable=True)
 
     user = relationship("User", back_populates="ledger_logs")
+
+
+class IndexerCursor(Base):
+    __tablename__ = "IndexerCursor"
+
+    name = Column(String, primary_key=True)
+    last_block = Column("lastBlock", BigInteger, nullable=False, default=0)
+    last_block_hash = Column("lastBlockHash", String, nullable=True)
+    recent_blocks = Column("recentBlocks", JSONPayload, nullable=True)
+    updated_at = Column("updatedAt", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class NavFeedCursor(Base):
+    __tablename__ = "NavFeedCursor"
+
+    name = Column(String, primary_key=True)
+    last_timestamp = Column("lastTimestamp", BigInteger, nullable=False)
+    last_digest = Column("lastDigest", String, nullable=False)
+    updated_at = Column("updatedAt", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class RedemptionJob(Base):
+    __tablename__ = "RedemptionJob"
+    __table_args__ = (Index("RedemptionJob_status_id_idx", "status", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    ticket = Column(String, unique=True, nullable=False)
+    external_id = Column("externalId", String, nullable=False)
+    holder_id = Column("holderId", String, nullable=False)
+    tokens = Column(Numeric(asdecimal=True), nullable=False)
+    status = Column(
+        SAEnum(RedemptionJobStatus, name="RedemptionJobStatus"),
+        nullable=False,
+        default=RedemptionJobStatus.QUEUED,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    http_status = Column("httpStatus", Integer, nullable=True)
+    result = Column(JSONPayload, nullable=True)
+    error = Column(String, nullable=True)
+    claimed_at = Column("claimedAt", DateTime, nullable=True)
+    completed_at = Column("completedAt", DateTime, nullable=True)
+    created_at = Column("createdAt", DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column("updatedAt", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+from sqlalchemy import insert, text
+from sqlalchemy.exc import IntegrityError
+
+from .models import (
+    Asset,
+    AssetType,
+    Issuance,
+    LedgerLog,
+    LogLevel,
+    NavFeedCursor,
+    Transaction,
+    TransactionType,
+)
+
+BPS_DIVISOR = Decimal(10_000)
+NAV_QUANTUM = Decimal("0.00000001")
+NAV_FEED_CURSOR = "nav_feed"
+
+
+class NavSnapshotError(ValueError):
+    """Raised when a NAV snapshot is malformed or its signature does not verify."""
+
+
+class NavSnapshotConflict(NavSnapshotError):
+    """Raised when a snapshot was already applied or is not newer than the last one applied."""
+
+
+@dataclass(slots=True)
+class NavSnapshot:
+    timestamp: int
+    nav_csdn: int
+    nav_sdn: int
+    floor_bps: int
+    price: str
+    payload: Dict[str, Any]
+    signature: str
+
+    @property
+    def digest(self) -> str:
+        return "0x" + hashlib.sha256(_canonical_payload(self.payload)).hexdigest()
+
+    def class_nav(self, asset_type: AssetType, decimals: int) -> Decimal:
+        raw = self.nav_csdn if asset_type is AssetType.CSDN else self.nav_sdn
+        return Decimal(raw).scaleb(-decimals)
+
+
+@dataclass(slots=True)
+class NavRevaluation:
+    issuance_ids: List[int]
+    asset_ids: List[int]
+    quantities: List[Decimal]
+    previous_nav: List[Decimal]
+    nav_per_token: List[Decimal]
+    policy_floor: List[Decimal]
+
+    def __len__(self) -> int:
+        return len(self.issuance_ids)
+
+
+def _canonical_payload(payload: Dict[str, Any]) -> bytes:
+    # Mirrors JSON.stringify(payload) in se7en-backend/src/lib/nav.ts.
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def parse_signed_snapshot(data: Dict[str, Any]) -> NavSnapshot:
+    payload = data.get("payload")
+    signature = data.get("signature")
+    if not isinstance(payload, dict) or not isinstance(signature, str):
+        raise NavSnapshotError("nav_snapshot_malformed")
+
+    try:
+        snapshot = NavSnapshot(
+            timestamp=int(payload["timestamp"]),
+            nav_csdn=int(payload["navCsdn"]),
+            nav_sdn=int(payload["navSdn"]),
+            floor_bps=int(payload["floorBps"]),
+            price=str(payload.get("price", "0")),
+            payload=payload,
+            signature=signature,
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise NavSnapshotError("nav_snapshot_malformed") from exc
+
+    if snapshot.nav_csdn < 0 or snapshot.nav_sdn < 0 or not 0 <= snapshot.floor_bps <= 10_000:
+        raise NavSnapshotError("nav_snapshot_out_of_range")
+    return snapshot
+
+
+def verify_nav_snapshot(snapshot: NavSnapshot, public_key_b64: str) -> None:
+    try:
+        verify_key = VerifyKey(base64.b64decode(public_key_b64))
+        verify_key.verify(_canonical_payload(snapshot.payload), base64.b64decode(snapshot.signature))
+    except (BadSignatureError, ValueError, TypeError) as exc:
+        raise NavSnapshotError("nav_signature_invalid") from exc
+
+
+def nav_cursor_name(asset_type: AssetType) -> str:
+    return f"{NAV_FEED_CURSOR}:{asset_type.value}"
+
+
+def claim_nav_snapshot(session, snapshot: NavSnapshot, asset_types: Optional[Sequence[AssetType]] = None) -> None:
+    """Advance the feed cursor of every asset type being revalued (default: all) or reject a replay.
+
+    Each asset type keeps its own cursor, so a run limited to CSDN leaves SDN free to take the
+    same snapshot later. Cursor rows are locked in a fixed order for the rest of the transaction,
+    so concurrent revaluations apply one at a time and never roll NAVs back to older values.
+    """
+
+    for asset_type in sorted(set(asset_types or AssetType), key=lambda value: value.value):
+        _claim_cursor(session, snapshot, nav_cursor_name(asset_type))
+
+
+def _claim_cursor(session, snapshot: NavSnapshot, cursor_name: str) -> None:
+    cursor = session.get(NavFeedCursor, cursor_name, with_for_update=True)
+    if cursor is None:
+        session.add(NavFeedCursor(name=cursor_name, last_timestamp=snapshot.timestamp, last_digest=snapshot.digest))
+        try:
+            session.flush()
+        except IntegrityError as exc:
+            # Another request applied the feed's first snapshot concurrently.
+            raise NavSnapshotConflict("nav_snapshot_conflict") from exc
+        return
+
+    if snapshot.digest == cursor.last_digest:
+        raise NavSnapshotConflict("nav_snapshot_replayed")
+    if snapshot.timestamp <= cursor.last_timestamp:
+        raise NavSnapshotConflict("nav_snapshot_stale")
+    cursor.last_timestamp = snapshot.timestamp
+    cursor.last_digest = snapshot.digest
+    session.flush()
+
+
+def compute_revaluation(
+    rows: Sequence[Tuple[int, int, AssetType, Decimal, Decimal, Decimal]],
+    snapshot: NavSnapshot,
+    decimals: int = 18,
+) -> NavRevaluation:
+    """Spread each class NAV across its issuances, weighted by asset valuation.
+
+    ``rows`` are ``(issuance_id, asset_id, asset_type, valuation_usd, quantity, nav_per_token)``.
+    Each asset receives ``class_nav * valuation / class_valuation`` and divides it over the
+    tokens of all its issuances; classes with no recorded valuation fall back to a flat
+    ``class_nav / class_quantity``.
+    """
+
+    if not rows:
+        return NavRevaluation([], [], [], [], [], [])
+
+    issuance_ids, asset_ids, asset_types, valuations, quantities, previous_nav = map(list, zip(*rows))
+
+    asset_quantity: Dict[int, Decimal] = defaultdict(Decimal)
+    asset_valuation: Dict[int, Decimal] = {}
+    asset_class: Dict[int, AssetType] = {}
+    for asset_id, asset_type, valuation, quantity in zip(asset_ids, asset_types, valuations, quantities):
+        asset_quantity[asset_id] += quantity
+        asset_valuation[asset_id] = valuation
+        asset_class[asset_id] = asset_type
+
+    class_valuation: Dict[AssetType, Decimal] = defaultdict(Decimal)
+    class_quantity: Dict[AssetType, Decimal] = defaultdict(Decimal)
+    for asset_id, asset_type in asset_class.items():
+        class_valuation[asset_type] += asset_valuation[asset_id]
+        class_quantity[asset_type] += asset_quantity[asset_id]
+
+    asset_nav: Dict[int, Decimal] = {}
+    for asset_id, asset_type in asset_class.items():
+        class_nav = snapshot.class_nav(asset_type, decimals)
+        tokens = asset_quantity[asset_id]
+        if tokens <= 0:
+            asset_nav[asset_id] = Decimal("0")
+        elif class_valuation[asset_type] > 0:
+            share = class_nav * asset_valuation[asset_id] / class_valuation[asset_type]
+            asset_nav[asset_id] = (share / tokens).quantize(NAV_QUANTUM)
+        else:
+            asset_nav[asset_id] = (class_nav / class_quantity[asset_type]).quantize(NAV_QUANTUM)
+
+    floor_ratio = Decimal(snapshot.floor_bps) / BPS_DIVISOR
+    nav_per_token = [asset_nav[asset_id] for asset_id in asset_ids]
+    policy_floor = [(nav * floor_ratio).quantize(NAV_QUANTUM) for nav in nav_per_token]
+
+    return NavRevaluation(
+        issuance_ids=issuance_ids,
+        asset_ids=asset_ids,
+        quantities=quantities,
+        previous_nav=previous_nav,
+        nav_per_token=nav_per_token,
+        policy_floor=policy_floor,
+    )
+
+
+def load_revaluation_rows(session, asset_types: Optional[Sequence[AssetType]] = None):
+    query = session.query(
+        Issuance.id,
+        Issuance.asset_id,
+        Asset.asset_type,
+        Asset.valuation_usd,
+        Issuance.quantity,
+        Issuance.nav_per_token,
+    ).join(Asset, Asset.id == Issuance.asset_id)
+    if asset_types:
+        query = query.filter(Asset.asset_type.in_(list(asset_types)))
+    return query.all()
+
+
+def apply_revaluation(session, snapshot: NavSnapshot, revaluation: NavRevaluation, user=None) -> int:
+    """Write a revaluation with one UPDATE ... FROM (VALUES ...) and one bulk NAV_UPDATE insert."""
+
+    if not revaluation:
+        return 0
+
+    # Rendered by hand: every value is an int or a Decimal we computed, and compiling
+    # 100k-row VALUES lists through SQLAlchemy literal binds costs seconds.
+    rendered = ",".join(
+        f"({int(issuance_id)},{format(nav, 'f')},{format(floor, 'f')})"
+        for issuance_id, nav, floor in zip(
+            revaluation.issuance_ids, revaluation.nav_per_token, revaluation.policy_floor
+        )
+    )
+    session.execute(
+        text(
+            f"WITH nav_update (id, nav, policy_floor) AS (VALUES {rendered}) "
+            'UPDATE "Issuance" SET "navPerToken" = nav_update.nav, "policyFloor" = nav_update.policy_floor '
+            'FROM nav_update WHERE "Issuance".id = nav_update.id'
+        )
+    )
+
+    digest = snapshot.digest
+    session.execute(
+        insert(Transaction),
+        [
+            {
+                "asset_id": asset_id,
+                "issuance_id": issuance_id,
+                "type": TransactionType.NAV_UPDATE,
+                "amount_usd": nav * quantity,
+                "metadata_payload": {
+                    "snapshotDigest": digest,
+                    "snapshotTimestamp": snapshot.timestamp,
+                    "previousNavPerToken": format(previous, "f"),
+                    "navPerToken": format(nav, "f"),
+                    "policyFloor": format(floor, "f"),
+                    "floorBps": snapshot.floor_bps,
+                },
+            }
+            for issuance_id, asset_id, quantity, previous, nav, floor in zip(
+                revaluation.issuance_ids,
+                revaluation.asset_ids,
+                revaluation.quantities,
+                revaluation.previous_nav,
+                revaluation.nav_per_token,
+                revaluation.policy_floor,
+            )
+        ],
+    )
+
+    session.add(
+        LedgerLog(
+            scope="treasury:nav",
+            level=LogLevel.INFO,
+            message=f"NAV revaluation applied to {len(revaluation)} issuances",
+            metadata_payload={
+                "snapshotDigest": digest,
+                "snapshotTimestamp": snapshot.timestamp,
+                "navCsdn": str(snapshot.nav_csdn),
+                "navSdn": str(snapshot.nav_sdn),
+                "floorBps": snapshot.floor_bps,
+                "issuances": len(revaluation),
+            },
+            user=user,
+        )
+    )
+    return len(revaluation)
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+from sqlalchemy import insert, select, update
+from urllib3.exceptions import NewConnectionError
+
+from .config import RedemptionWorkerConfig, load_config, load_redemption_worker_config
+from .db import init_engine, session_scope
+from .models import (
+    Asset,
+    AssetStatus,
+    FiduciaryRole,
+    Issuance,
+    LedgerLog,
+    LogLevel,
+    RedemptionJob,
+    RedemptionJobStatus,
+    Transaction,
+    TransactionType,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RedemptionOutcome:
+    job_id: int
+    status: RedemptionJobStatus
+    http_status: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def settled(self) -> bool:
+        return self.status in (RedemptionJobStatus.COMPLETED, RedemptionJobStatus.REJECTED)
+
+
+def enqueue_redemption(session, external_id: str, holder_id: str, tokens: Decimal) -> RedemptionJob:
+    job = RedemptionJob(
+        ticket=uuid.uuid4().hex,
+        external_id=external_id,
+        holder_id=holder_id,
+        tokens=tokens,
+        status=RedemptionJobStatus.QUEUED,
+    )
+    session.add(job)
+    session.flush()
+    return job
+
+
+def _lease_clock() -> datetime:
+    # claimedAt is TIMESTAMP(3); keep the claim time at the stored precision so the
+    # outcome write can match it exactly.
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def claim_batch(session, batch_size: int, lease_s: float, now: Optional[datetime] = None) -> List[RedemptionJob]:
+    """Claim up to ``batch_size`` queued jobs; concurrent workers skip each other's rows."""
+
+    now = now or _lease_clock()
+
+    # A job still PROCESSING after its lease may already have reached se7en, and
+    # se7en redemptions are not idempotent, so it is failed for review, not retried.
+    session.execute(
+        update(RedemptionJob)
+        .where(
+            RedemptionJob.status == RedemptionJobStatus.PROCESSING,
+            RedemptionJob.claimed_at < now - timedelta(seconds=lease_s),
+        )
+        .values(status=RedemptionJobStatus.FAILED, error="lease_expired", completed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+    jobs = (
+        session.execute(
+            select(RedemptionJob)
+            .where(RedemptionJob.status == RedemptionJobStatus.QUEUED)
+            .order_by(RedemptionJob.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    for job in jobs:
+        job.status = RedemptionJobStatus.PROCESSING
+        job.attempts += 1
+        job.claimed_at = now
+    session.flush()
+    return jobs
+
+
+def _tokens_json(tokens: Decimal) -> int | float:
+    return int(tokens) if tokens == tokens.to_integral_value() else float(tokens)
+
+
+def _request_never_sent(exc: requests.ConnectionError) -> bool:
+    """True only when no connection to se7en was established, so the redemption cannot have run.
+
+    requests also raises ConnectionError when a pooled keep-alive connection drops after the
+    body was written ("Connection aborted"); se7en may have paid out, so that is not a retry.
+    """
+
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    cause = exc.args[0] if exc.args else None
+    return isinstance(getattr(cause, "reason", cause), NewConnectionError)
+
+
+def _outcomes(jobs: Sequence[RedemptionJob], status: RedemptionJobStatus, **fields: Any) -> List[RedemptionOutcome]:
+    return [RedemptionOutcome(job_id=job.id, status=status, **fields) for job in jobs]
+
+
+def requeue_unsent(jobs: Sequence[RedemptionJob], max_attempts: int, error: str) -> List[RedemptionOutcome]:
+    """Outcomes for jobs that never reached se7en: queued again until attempts run out."""
+
+    return [
+        RedemptionOutcome(
+            job_id=job.id,
+            status=RedemptionJobStatus.QUEUED if job.attempts < max_attempts else RedemptionJobStatus.FAILED,
+            error=error,
+        )
+        for job in jobs
+    ]
+
+
+def submit_redemptions(
+    http: requests.Session, se7en_url: str, jobs: Sequence[RedemptionJob], max_attempts: int, timeout_s: float = 10
+) -> List[RedemptionOutcome]:
+    """Submit a claimed batch as one ``/treasury/redeem/batch`` call; se7en applies it in one transaction."""
+
+    try:
+        response = http.post(
+            f"{se7en_url}/treasury/redeem/batch",
+            json={"redemptions": [{"holderId": job.holder_id, "tokens": _tokens_json(job.tokens)} for job in jobs]},
+            timeout=timeout_s,
+        )
+    except requests.ConnectionError as exc:
+        if not _request_never_sent(exc):
+            return _outcomes(jobs, RedemptionJobStatus.FAILED, error=f"se7en_connection_lost: {exc}")
+        return requeue_unsent(jobs, max_attempts, f"se7en_unreachable: {exc}")
+    except requests.RequestException as exc:
+        return _outcomes(jobs, RedemptionJobStatus.FAILED, error=f"se7en_unreachable: {exc}")
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    invalid = _outcomes(
+        jobs, RedemptionJobStatus.FAILED, http_status=response.status_code, error="se7en_invalid_response"
+    )
+    if not isinstance(body, dict):
+        return invalid
+    if not body.get("ok"):
+        # The whole batch was refused (e.g. treasury_uninitialized) before anything was applied.
+        body["source"] = "se7en"
+        return _outcomes(jobs, RedemptionJobStatus.REJECTED, http_status=response.status_code, result=body)
+    results = body.get("results")
+    if not isinstance(results, list) or len(results) != len(jobs) or not all(isinstance(r, dict) for r in results):
+        return invalid
+
+    outcomes = []
+    for job, result in zip(jobs, results):
+        result = dict(result, source="se7en")
+        status = RedemptionJobStatus.COMPLETED if result.get("ok") else RedemptionJobStatus.REJECTED
+        outcomes.append(
+            RedemptionOutcome(job_id=job.id, status=status, http_status=response.status_code, result=result)
+        )
+    return outcomes
+
+
+def apply_outcomes(
+    session, jobs: Sequence[RedemptionJob], outcomes: Sequence[RedemptionOutcome], claimed_at: datetime
+) -> None:
+    """Bulk-write a processed batch: job rows, REDEMPTION transactions, ledger logs and asset status.
+
+    Only jobs still PROCESSING under this worker's claim are written. A job another worker
+    already failed as ``lease_expired`` stays FAILED for review instead of being flipped to
+    COMPLETED; its se7en response is logged for whoever reviews it.
+    """
+
+    held = set(
+        session.execute(
+            select(RedemptionJob.id)
+            .where(
+                RedemptionJob.id.in_([outcome.job_id for outcome in outcomes]),
+                RedemptionJob.status == RedemptionJobStatus.PROCESSING,
+                RedemptionJob.claimed_at == claimed_at,
+            )
+            .with_for_update()
+        ).scalars()
+    )
+    processed = []
+    for job, outcome in zip(jobs, outcomes):
+        if job.id in held:
+            processed.append((job, outcome))
+        else:
+            logger.warning(
+                "Redemption %s lost its lease before the outcome was written: %s %s",
+                job.ticket,
+                outcome.status.value,
+                outcome.result or outcome.error,
+            )
+    if not processed:
+        return
+
+    now = datetime.utcnow()
+    session.execute(
+        update(RedemptionJob)
+        .where(RedemptionJob.status == RedemptionJobStatus.PROCESSING, RedemptionJob.claimed_at == claimed_at)
+        .execution_options(synchronize_session=None),
+        [
+            {
+                "id": outcome.job_id,
+                "status": outcome.status,
+                "http_status": outcome.http_status,
+                "result": outcome.result,
+                "error": outcome.error,
+                "claimed_at": None if outcome.status is RedemptionJobStatus.QUEUED else now,
+                "completed_at": None if outcome.status is RedemptionJobStatus.QUEUED else now,
+            }
+            for _job, outcome in processed
+        ],
+    )
+
+    settled = [(job, outcome) for job, outcome in processed if outcome.settled]
+    if not settled:
+        return
+
+    external_ids = {job.external_id for job, _ in settled}
+    assets = {
+        asset.external_id: asset
+        for asset in session.query(Asset).filter(Asset.external_id.in_(external_ids))
+    }
+    latest_issuance: Dict[int, int] = {}
+    for asset_id, issuance_id in (
+        session.query(Issuance.asset_id, Issuance.id)
+        .filter(Issuance.asset_id.in_([asset.id for asset in assets.values()]))
+        .order_by(Issuance.created_at)
+    ):
+        latest_issuance[asset_id] = issuance_id
+    oracle_user = session.query(User).filter(User.role == FiduciaryRole.ORACLE).first()
+
+    transaction_rows: List[Dict[str, Any]] = []
+    ledger_rows: List[Dict[str, Any]] = []
+    redeemed_asset_ids = set()
+    for job, outcome in settled:
+        asset = assets.get(job.external_id)
+        if asset is None:
+            continue
+        ok = bool(outcome.result and outcome.result.get("ok"))
+        transaction_rows.append(
+            {
+                "asset_id": asset.id,
+                "issuance_id": latest_issuance.get(asset.id),
+                "type": TransactionType.REDEMPTION,
+                "amount_usd": job.tokens,
+                "metadata_payload": {"holderId": job.holder_id, "status": ok, "ticket": job.ticket},
+            }
+        )
+        ledger_rows.append(
+            {
+                "scope": f"workflow:{asset.external_id.lower()}",
+                "level": LogLevel.INFO,
+                "message": f"Redemption processed for {asset.name}",
+                "metadata_payload": {
+                    "holderId": job.holder_id,
+                    "tokens": format(job.tokens, "f"),
+                    "ticket": job.ticket,
+                },
+                "user_id": oracle_user.id if oracle_user else None,
+            }
+        )
+        if ok:
+            redeemed_asset_ids.add(asset.id)
+
+    if transaction_rows:
+        session.execute(insert(Transaction), transaction_rows)
+        session.execute(insert(LedgerLog), ledger_rows)
+    if redeemed_asset_ids:
+        session.execute(
+            update(Asset)
+            .where(Asset.id.in_(redeemed_asset_ids))
+            .values(status=AssetStatus.REDEEMED)
+            .execution_options(synchronize_session=False)
+        )
+
+
+# se7en's /treasury/redeem/batch accepts at most this many redemptions per call.
+SE7EN_MAX_BATCH = 500
+
+
+class RedemptionWorker:
+    def __init__(self, config: RedemptionWorkerConfig, se7en_url: str, http: Optional[requests.Session] = None):
+        if not 0 < config.batch_size <= SE7EN_MAX_BATCH:
+            raise ValueError(f"REDEMPTION_BATCH_SIZE must be between 1 and {SE7EN_MAX_BATCH}")
+        # Each batch is one se7en round trip, which must finish while the claim is still
+        # leased or another worker fails the jobs for review while they are in flight.
+        if config.lease_s <= config.timeout_s:
+            raise ValueError("REDEMPTION_LEASE_S must exceed REDEMPTION_SE7EN_TIMEOUT_S")
+        self.config = config
+        self.se7en_url = se7en_url
+        self.http = http or requests.Session()
+
+    def run_once(self) -> int:
+        with session_scope() as session:
+            jobs = claim_batch(session, self.config.batch_size, self.config.lease_s)
+        if not jobs:
+            return 0
+
+        claimed_at = jobs[0].claimed_at
+        lease_left = claimed_at + timedelta(seconds=self.config.lease_s) - datetime.utcnow()
+        if lease_left.total_seconds() <= self.config.timeout_s:
+            # Not enough lease left to finish the call; nothing was sent, so hand the jobs back.
+            outcomes = requeue_unsent(jobs, self.config.max_attempts, "lease_expired_before_submit")
+        else:
+            outcomes = submit_redemptions(
+                self.http, self.se7en_url, jobs, self.config.max_attempts, self.config.timeout_s
+            )
+        with session_scope() as session:
+            apply_outcomes(session, jobs, outcomes, claimed_at)
+        return len(jobs)
+
+    def drain(self) -> int:
+        processed = 0
+        while True:
+            count = self.run_once()
+            if count == 0:
+                return processed
+            processed += count
+
+    def close(self) -> None:
+        self.http.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Submit queued redemptions to se7en in batches.")
+    parser.add_argument("--once", action="store_true", help="drain the queue and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    config = load_config()
+    init_engine(config.database_url)
+    worker_config = load_redemption_worker_config()
+    worker = RedemptionWorker(worker_config, config.se7en_url)
+
+    try:
+        while True:
+            started = time.perf_counter()
+            processed = worker.drain()
+            if processed:
+                elapsed = time.perf_counter() - started
+                logger.info("Processed %s redemptions in %.2fs (%.1f/s)", processed, elapsed, processed / elapsed)
+            if args.once:
+                return 0
+            time.sleep(worker_config.poll_interval_s)
+    finally:
+        worker.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,13 @@ import requests
 from flask import Blueprint, current_app, jsonify, request
 from web3 import Web3
 
+from .affidavits import (
+    AffidavitAnchorError,
+    AffidavitImportError,
+    bulk_import_affidavits,
+    inclusion_proof,
+    record_anchor,
+)
 from .db import session_scope
 from .models import (
     Affidavit,
@@ -19,11 +26,29 @@ from .models import (
     Issuance,
     LedgerLog,
     LogLevel,
+    RedemptionJob,
     Transaction,
     TransactionType,
     User,
 )
-from .serialization import serialize_affidavit, serialize_asset, serialize_transaction
+from .nav import (
+    NavSnapshotConflict,
+    NavSnapshotError,
+    apply_revaluation,
+    claim_nav_snapshot,
+    compute_revaluation,
+    load_revaluation_rows,
+    parse_signed_snapshot,
+    verify_nav_snapshot,
+)
+from .redemptions import enqueue_redemption
+from .serialization import (
+    serialize_affidavit,
+    serialize_affidavit_batch,
+    serialize_asset,
+    serialize_redemption_job,
+    serialize_transaction,
+)
 
 bp = Blueprint("sovereign", __name__)
 
@@ -44,6 +69,11 @@ def health():
     return jsonify({"ok": True, "service": "api-gateway", "mode": config.estate_mode})
 
 
+@bp.get("/admission")
+def admission_metrics():
+    return jsonify({"ok": True, "admission": current_app.extensions["admission"].snapshot()})
+
+
 @bp.post("/intake")
 def intake():
     payload = request.get_json(force=True) or {}
@@ -294,6 +324,40 @@ def circulate():
         return jsonify({"ok": True, "asset": serialize_asset(asset), "transaction": serialize_transaction(tx_entry)})
 
 
+@bp.post("/nav/revalue")
+def revalue_nav():
+    payload = request.get_json(force=True) or {}
+    config = current_app.config["ESTATE_CONFIG"]
+
+    if not config.nav_feed_pubkey:
+        return jsonify({"ok": False, "error": "nav_feed_unconfigured"}), 503
+
+    asset_type_values = payload.get("assetTypes", [])
+    if not isinstance(asset_type_values, list) or not all(isinstance(value, str) for value in asset_type_values):
+        return jsonify({"ok": False, "error": "invalid_asset_type"}), 400
+
+    try:
+        snapshot = parse_signed_snapshot(payload)
+        verify_nav_snapshot(snapshot, config.nav_feed_pubkey)
+        asset_types = [AssetType(value.upper()) for value in asset_type_values]
+    except NavSnapshotError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+    except ValueError:
+        return jsonify({"ok": False, "error": "invalid_asset_type"}), 400
+
+    try:
+        with session_scope() as session:
+            claim_nav_snapshot(session, snapshot, asset_types)
+            rows = load_revaluation_rows(session, asset_types)
+            revaluation = compute_revaluation(rows, snapshot, config.nav_feed_decimals)
+            treasury_user = _user_for_role(session, FiduciaryRole.TREASURY)
+            updated = apply_revaluation(session, snapshot, revaluation, user=treasury_user)
+    except NavSnapshotConflict as exc:
+        return jsonify({"ok": False, "error": str(exc), "snapshotDigest": snapshot.digest}), 409
+
+    return jsonify({"ok": True, "updated": updated, "snapshotDigest": snapshot.digest})
+
+
 @bp.post("/redeem")
 def redeem():
     payload = request.get_json(force=True) or {}
@@ -304,7 +368,31 @@ def redeem():
     if not all([external_id, holder_id, tokens]):
         return jsonify({"ok": False, "error": "missing_required_fields"}), 400
 
+    try:
+        tokens_decimal = _decimal_from_payload(tokens)
+    except (ArithmeticError, ValueError):
+        return jsonify({"ok": False, "error": "invalid_tokens"}), 400
+    if not tokens_decimal.is_finite() or tokens_decimal <= 0:
+        return jsonify({"ok": False, "error": "invalid_tokens"}), 400
+
     config = current_app.config["ESTATE_CONFIG"]
+    async_mode = payload.get("async", config.redemption_mode == "ASYNC")
+    if not isinstance(async_mode, bool):
+        return jsonify({"ok": False, "error": "invalid_async"}), 400
+
+    if async_mode:
+        with session_scope() as session:
+            # The worker settles against the asset, so unknown assets are refused before se7en pays out.
+            if session.query(Asset.id).filter(Asset.external_id == external_id).one_or_none() is None:
+                return jsonify({"ok": False, "error": "asset_not_found"}), 404
+
+            job = enqueue_redemption(session, external_id, holder_id, tokens_decimal)
+            return (
+                jsonify({"ok": True, "ticket": job.ticket, "status": job.status.value, "source": "queue"}),
+                202,
+                {"Location": f"/redeem/{job.ticket}"},
+            )
+
     try:
         response = requests.post(
             f"{config.se7en_url}/treasury/redeem",
@@ -331,7 +419,7 @@ def redeem():
                 asset_id=asset.id,
                 issuance_id=issuance.id if issuance else None,
                 type=TransactionType.REDEMPTION,
-                amount_usd=_decimal_from_payload(tokens),
+                amount_usd=tokens_decimal,
                 metadata_payload={"holderId": holder_id, "status": redemption.get("ok")},
             )
             session.add(tx_entry)
@@ -354,6 +442,15 @@ def redeem():
     return jsonify(redemption), status_code
 
 
+@bp.get("/redeem/<ticket>")
+def redeem_status(ticket: str):
+    with session_scope() as session:
+        job = session.query(RedemptionJob).filter(RedemptionJob.ticket == ticket).one_or_none()
+        if job is None:
+            return jsonify({"ok": False, "error": "redemption_not_found"}), 404
+        return jsonify({"ok": True, "redemption": serialize_redemption_job(job)})
+
+
 @bp.get("/verify/<attestation_id>")
 def verify(attestation_id: str):
     with session_scope() as session:
@@ -366,5 +463,44 @@ def verify(attestation_id: str):
                 "ok": True,
                 "attestation": serialize_affidavit(affidavit),
                 "asset": serialize_asset(asset),
+                "inclusion": inclusion_proof(affidavit),
             }
         )
+
+
+@bp.post("/affidavits/import")
+def import_affidavits():
+    payload = request.get_json(force=True) or {}
+    records = payload.get("affidavits")
+
+    if not isinstance(records, list) or not records:
+        return jsonify({"ok": False, "error": "missing_required_fields"}), 400
+
+    with session_scope() as session:
+        try:
+            result = bulk_import_affidavits(session, records)
+        except AffidavitImportError as exc:
+            status = 404 if exc.code == "asset_not_found" else 400
+            return jsonify({"ok": False, "error": exc.code, **(exc.detail or {})}), status
+
+    # Sealing hashes every pending leaf; `make affidavit-batcher` does it outside the request.
+    return jsonify({"ok": True, "inserted": result.inserted, "duplicates": result.duplicates})
+
+
+@bp.post("/affidavits/batches/<int:batch_id>/anchor")
+def anchor_affidavit_batch(batch_id: int):
+    payload = request.get_json(force=True) or {}
+    tx_hash = payload.get("txHash")
+
+    if not tx_hash:
+        return jsonify({"ok": False, "error": "missing_required_fields"}), 400
+
+    with session_scope() as session:
+        try:
+            batch = record_anchor(session, batch_id, tx_hash)
+        except AffidavitAnchorError as exc:
+            status = 409 if exc.code == "already_anchored" else 400
+            return jsonify({"ok": False, "error": exc.code, **(exc.detail or {})}), status
+        if batch is None:
+            return jsonify({"ok": False, "error": "affidavit_batch_not_found"}), 404
+        return jsonify({"ok": True, "batch": serialize_affidavit_batch(batch)})
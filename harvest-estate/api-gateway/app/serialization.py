@@ -3,7 +3,7 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Any, Dict
 
-from .models import Affidavit, Asset, InsuranceBand, Issuance, LedgerLog, Transaction
+from .models import Affidavit, AffidavitBatch, Asset, InsuranceBand, Issuance, LedgerLog, RedemptionJob, Transaction
 
 
 def _decimal(value: Decimal | None) -> str | None:
@@ -66,6 +66,18 @@ def serialize_affidavit(affidavit: Affidavit) -> Dict[str, Any]:
     }
 
 
+def serialize_affidavit_batch(batch: AffidavitBatch) -> Dict[str, Any]:
+    return {
+        "id": batch.id,
+        "root": batch.root,
+        "leafCount": batch.leaf_count,
+        "depth": batch.depth,
+        "anchorTxHash": batch.anchor_tx_hash,
+        "anchoredAt": batch.anchored_at.isoformat() if batch.anchored_at else None,
+        "createdAt": batch.created_at.isoformat() if batch.created_at else None,
+    }
+
+
 def serialize_transaction(tx: Transaction) -> Dict[str, Any]:
     return {
         "id": tx.id,
@@ -94,3 +106,19 @@ def serialize_ledger_log(log: LedgerLog) -> Dict[str, Any]:
         if log.user
         else None,
     }
+
+
+def serialize_redemption_job(job: RedemptionJob) -> Dict[str, Any]:
+    return {
+        "ticket": job.ticket,
+        "externalId": job.external_id,
+        "holderId": job.holder_id,
+        "tokens": _decimal(job.tokens),
+        "status": job.status.value,
+        "attempts": job.attempts,
+        "httpStatus": job.http_status,
+        "result": job.result,
+        "error": job.error,
+        "createdAt": job.created_at.isoformat() if job.created_at else None,
+        "completedAt": job.completed_at.isoformat() if job.completed_at else None,
+    }
@@ -0,0 +1,84 @@
+"""Time bulk affidavit import and Merkle batch sealing.
+
+Usage (from api-gateway/):
+
+    python -m scripts.bench_affidavit_batches --leaves 1000000
+
+Runs in-process on an embedded SQLite file unless DATABASE_URL points at a scratch Postgres database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import time
+
+from app.affidavits import bulk_import_affidavits, seal_batch
+from app.config import load_config
+from app.db import init_engine, session_scope
+from app.main import create_app
+from app.merkle import affidavit_leaf, all_proofs, build_levels, verify_proof
+from app.models import Affidavit, Base
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leaves", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='bench-affidavits-')}/estate.db")
+    os.environ.setdefault("DATABASE_SEED", "true")
+    Base.metadata.create_all(init_engine(load_config().database_url))
+    create_app()
+
+    hashes = [hashlib.sha256(f"bench-affidavit-{index}".encode()).hexdigest() for index in range(args.leaves)]
+
+    started = time.perf_counter()
+    leaves = [affidavit_leaf(value) for value in hashes]
+    hashed = time.perf_counter()
+    levels = build_levels(leaves)
+    built = time.perf_counter()
+    proofs = all_proofs(levels)
+    proved = time.perf_counter()
+    print(
+        f"merkle : {args.leaves} leaves hashed {hashed - started:.2f}s, tree {built - hashed:.2f}s, "
+        f"proofs {proved - built:.2f}s (depth {len(levels) - 1})"
+    )
+    assert all(verify_proof(leaves[i], proofs[i], levels[-1]) for i in random.sample(range(args.leaves), 100))
+
+    records = [
+        {
+            "externalId": "HAS-ALPHA",
+            "hash": value,
+            "jurisdiction": "US-DE",
+            "clauseRef": "EYEION-BENCH",
+            "issuedBy": "Eyeion Legal Chain",
+        }
+        for value in hashes
+    ]
+    started = time.perf_counter()
+    with session_scope() as session:
+        imported = bulk_import_affidavits(session, records)
+    import_s = time.perf_counter() - started
+    print(f"import : {imported.inserted} affidavits in {import_s:.2f}s -> {imported.inserted / import_s:.0f}/s")
+
+    started = time.perf_counter()
+    with session_scope() as session:
+        batch = seal_batch(session, max_leaves=args.leaves + 2)
+    seal_s = time.perf_counter() - started
+    print(f"seal   : {batch.leaf_count} leaves in {seal_s:.2f}s, root {batch.root}")
+
+    started = time.perf_counter()
+    with session_scope() as session:
+        sample = session.query(Affidavit).filter(Affidavit.hash == hashes[args.leaves // 2]).one()
+        assert verify_proof(affidavit_leaf(sample.hash), sample.merkle_proof, bytes.fromhex(batch.root[2:]))
+    print(f"verify : one inclusion proof in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
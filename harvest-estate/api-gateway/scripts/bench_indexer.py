@@ -0,0 +1,117 @@
+"""Measure chain indexer backfill throughput in blocks/second.
+
+Usage (from api-gateway/):
+
+    python -m scripts.bench_indexer --blocks 50000 --events-per-block 1 --latency-ms 25
+
+By default the indexer is driven through a synthetic chain: ``eth_getLogs`` returns encoded
+HRVST ``MintByNAV`` logs after ``--latency-ms`` of simulated RPC time and rejects windows over
+``--max-results`` logs, the way Anvil and hosted providers do. Pass ``--rpc-url`` to backfill a
+live node (e.g. Anvil after seeding events with the contract scripts) using the
+``*_ADDRESS`` variables instead. Runs on an embedded SQLite file unless DATABASE_URL is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+from eth_abi import encode
+from web3 import Web3
+
+from app.config import load_config, load_indexer_config
+from app.db import init_engine
+from app.indexer import ChainIndexer
+from app.models import Base
+
+HRVST_ADDRESS = "0x00000000000000000000000000000000000000a1"
+MINT_BY_NAV_TOPIC = Web3.keccak(text="MintByNAV(address,uint256,uint256,uint256,uint256)")
+
+
+class SyntheticChain:
+    """``eth_getLogs`` over ``blocks`` blocks with ``events_per_block`` MintByNAV logs each."""
+
+    def __init__(self, blocks: int, events_per_block: int, latency_s: float, max_results: int) -> None:
+        self.head = blocks
+        self.events_per_block = events_per_block
+        self.latency_s = latency_s
+        self.max_results = max_results
+        self.calls = 0
+        self._address = Web3.to_checksum_address(HRVST_ADDRESS)
+        self._holder = bytes(31) + b"\xb2"
+        self._data = encode(["uint256"] * 4, [5 * 10**18, 100, 200, 8_500])
+
+    def block_hash(self, block_number: int) -> str:
+        return Web3.to_hex(Web3.keccak(text=f"block-{block_number}"))
+
+    def get_logs(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        self.calls += 1
+        time.sleep(self.latency_s)
+        start, end = int(params["fromBlock"]), int(params["toBlock"])
+        if (end - start + 1) * self.events_per_block > self.max_results:
+            raise ValueError({"code": -32005, "message": f"query returned more than {self.max_results} results"})
+        return [
+            {
+                "address": self._address,
+                "topics": [MINT_BY_NAV_TOPIC, self._holder],
+                "data": self._data,
+                "blockNumber": block,
+                "blockHash": self.block_hash(block),
+                "transactionHash": Web3.keccak(text=f"tx-{block}-{index}"),
+                "transactionIndex": index,
+                "logIndex": index,
+            }
+            for block in range(start, end + 1)
+            for index in range(self.events_per_block)
+        ]
+
+
+class SyntheticChainIndexer(ChainIndexer):
+    def __init__(self, config, chain: SyntheticChain, cursor_name: str) -> None:
+        super().__init__(config, w3=Web3(), cursor_name=cursor_name, get_logs=chain.get_logs)
+        self.chain = chain
+
+    def safe_head(self) -> int:
+        return self.chain.head - self.config.confirmations
+
+    def _block_hash(self, block_number: int) -> str:
+        return self.chain.block_hash(block_number)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blocks", type=int, default=50_000)
+    parser.add_argument("--events-per-block", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=25, help="simulated eth_getLogs round trip")
+    parser.add_argument("--max-results", type=int, default=10_000, help="logs per eth_getLogs before the node rejects")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rpc-url", default=None, help="backfill a live node instead of the synthetic chain")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='bench-indexer-')}/estate.db")
+    Base.metadata.create_all(init_engine(load_config().database_url))
+
+    for concurrency in args.concurrency:
+        cursor_name = f"bench-{concurrency}-{time.time_ns()}"
+        if args.rpc_url:
+            config = replace(load_indexer_config(), rpc_url=args.rpc_url, concurrency=concurrency)
+            indexer = ChainIndexer(config, cursor_name=cursor_name)
+        else:
+            chain = SyntheticChain(args.blocks, args.events_per_block, args.latency_ms / 1000, args.max_results)
+            config = replace(
+                load_indexer_config(), addresses={"hrvst": HRVST_ADDRESS}, start_block=1, concurrency=concurrency
+            )
+            indexer = SyntheticChainIndexer(config, chain, cursor_name)
+
+        stats = indexer.backfill()
+        print(f"concurrency={concurrency} {json.dumps(stats.as_dict())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""Compare inline and queued redemptions against a local se7en stub.
+
+Usage (from api-gateway/):
+
+    python -m scripts.bench_redemptions --requests 500 --latency-ms 20
+
+Runs in-process on an embedded SQLite file unless DATABASE_URL points at a scratch Postgres
+database; compare against Postgres before drawing conclusions about SKIP LOCKED throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.config import load_redemption_worker_config
+from app.db import init_engine, session_scope
+from app.models import Asset, AssetStatus, AssetType, Base
+from app.redemptions import RedemptionWorker
+
+
+def start_se7en_stub(latency_s: float, per_redemption_s: float) -> ThreadingHTTPServer:
+    """se7en stand-in: ``latency_s`` per call plus ``per_redemption_s`` per applied redemption."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if self.path.endswith("/batch"):
+                redemptions = payload.get("redemptions", [])
+                time.sleep(latency_s + per_redemption_s * len(redemptions))
+                body = {"ok": True, "results": [{"ok": True, **item} for item in redemptions]}
+            else:
+                time.sleep(latency_s + per_redemption_s)
+                body = {"ok": True, "holderId": payload.get("holderId"), "tokens": payload.get("tokens")}
+            encoded = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, *_args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20, help="se7en round trip per call")
+    parser.add_argument(
+        "--apply-ms", type=float, default=1, help="se7en time to apply one redemption inside its transaction"
+    )
+    parser.add_argument("--clients", type=int, default=8, help="concurrent HTTP clients hitting /redeem")
+    args = parser.parse_args()
+
+    server = start_se7en_stub(args.latency_ms / 1000, args.apply_ms / 1000)
+    se7en_url = f"http://127.0.0.1:{server.server_port}"
+    os.environ["SE7EN_API_URL"] = se7en_url
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='bench-redemptions-')}/estate.db")
+
+    from app.main import create_app
+
+    app = create_app()
+    engine = init_engine(app.config["ESTATE_CONFIG"].database_url)
+    Base.metadata.create_all(engine)
+    with session_scope() as session:
+        if session.query(Asset).filter(Asset.external_id == "BENCH-REDEEM").one_or_none() is None:
+            session.add(
+                Asset(
+                    external_id="BENCH-REDEEM",
+                    name="Bench Redemption Asset",
+                    asset_type=AssetType.CSDN,
+                    jurisdiction="US-DE-TRUST",
+                    status=AssetStatus.ISSUED,
+                )
+            )
+
+    def fire(async_mode: bool) -> float:
+        per_client = args.requests // args.clients
+
+        def client_loop():
+            client = app.test_client()
+            for index in range(per_client):
+                client.post(
+                    "/redeem",
+                    json={"externalId": "BENCH-REDEEM", "holderId": f"H-{index}", "tokens": 10, "async": async_mode},
+                )
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client_loop) for _ in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    total = (args.requests // args.clients) * args.clients
+    inline_s = fire(async_mode=False)
+    print(f"inline : {total} redemptions in {inline_s:.2f}s -> {total / inline_s:.1f}/s")
+
+    enqueue_s = fire(async_mode=True)
+    print(f"enqueue: {total} tickets in {enqueue_s:.2f}s -> {total / enqueue_s:.1f}/s accepted")
+
+    worker = RedemptionWorker(load_redemption_worker_config(), se7en_url)
+    started = time.perf_counter()
+    processed = worker.drain()
+    drain_s = time.perf_counter() - started
+    worker.close()
+    print(f"worker : drained {processed} in {drain_s:.2f}s -> {processed / drain_s:.1f}/s")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from nacl.signing import SigningKey
+
+from app.config import AdmissionConfig, IndexerConfig, load_config
+from app.db import dispose_engine
+from app.main import create_app
+
+TEST_CONFIGS: Dict[type, Dict[str, Any]] = {
+    AdmissionConfig: dict(
+        enabled=True,
+        global_limit=4,
+        critical_reserve=1,
+        queue_size=2,
+        queue_timeout_s=0.05,
+        retry_after_s=3,
+        adaptive=False,
+        latency_tolerance=2.0,
+        route_limits={"redeem": 1},
+    ),
+    IndexerConfig: dict(
+        rpc_url="http://127.0.0.1:8545",
+        confirmations=12,
+        start_block=0,
+        range_size=100,
+        min_range=10,
+        max_range=1_000,
+        concurrency=2,
+        poll_interval_s=0,
+        addresses={"hrvst": "0x00000000000000000000000000000000000000a1"},
+    ),
+}
+
+# Keys in sorted order: the Flask test client sorts them when encoding the request.
+NAV_SNAPSHOT = {
+    "floorBps": 8_500,
+    "navCsdn": str(380_038_75 * 10**16),
+    "navSdn": str(223_200 * 10**18),
+    "price": "1",
+    "timestamp": 1_760_000_000,
+}
+
+
+class NavFeed:
+    """Signs NAV snapshots the way the feed does, with a throwaway ed25519 key."""
+
+    def __init__(self) -> None:
+        self.key = SigningKey.generate()
+        self.public_key = base64.b64encode(bytes(self.key.verify_key)).decode()
+
+    def sign(self, **overrides: Any) -> Dict[str, Any]:
+        payload = {**NAV_SNAPSHOT, **overrides}
+        signature = self.key.sign(json.dumps(payload, separators=(",", ":")).encode()).signature
+        return {"payload": payload, "signature": base64.b64encode(signature).decode()}
+
+
+class Se7enResponse:
+    def __init__(self, status_code: int, body: Any) -> None:
+        self.status_code = status_code
+        self._body = body
+
+    def json(self) -> Any:
+        if isinstance(self._body, Exception):
+            raise self._body
+        return self._body
+
+
+def _se7en_ok(url: str, payload: Any) -> Tuple[int, Any]:
+    if url.endswith("/treasury/redeem/batch"):
+        return 200, {"ok": True, "results": [{"ok": True, "usdPaid": 910.0} for _ in payload["redemptions"]]}
+    return 200, {"ok": True, "usdPaid": 910.0}
+
+
+class Se7enStub:
+    """Stands in for the ``requests`` session used to call se7en and records every POST.
+
+    ``respond(url, payload)`` returns ``(status_code, body)`` (a body exception is raised by
+    ``json()``), or an exception for ``post`` itself to raise.
+    """
+
+    def __init__(self, respond: Callable[[str, Any], Any] = _se7en_ok) -> None:
+        self.respond = respond
+        self.calls: List[Tuple[str, Any]] = []
+
+    def post(self, url: str, json: Any = None, timeout: Optional[float] = None, **_kwargs: Any) -> Se7enResponse:
+        self.calls.append((url, json))
+        outcome = self.respond(url, json)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Se7enResponse(*outcome)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="session")
+def make_config() -> Callable[..., Any]:
+    """``make_config(IndexerConfig, confirmations=5)``: a config dataclass from test defaults."""
+
+    def build(config_cls: type, **overrides: Any) -> Any:
+        return config_cls(**{**TEST_CONFIGS[config_cls], **overrides})
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def nav_feed() -> NavFeed:
+    return NavFeed()
+
+
+@pytest.fixture(scope="session")
+def make_se7en() -> Callable[..., Se7enStub]:
+    return Se7enStub
+
+
+@pytest.fixture
+def se7en(make_se7en) -> Se7enStub:
+    return make_se7en()
+
+
+@pytest.fixture
+def app(monkeypatch, nav_feed):
+    """Gateway on a seeded in-memory SQLite database, trusting the ``nav_feed`` signer."""
+
+    monkeypatch.setenv("ADMISSION_ENABLED", "false")
+    app = create_app(
+        replace(load_config(), database_url="sqlite://", database_seed=True, nav_feed_pubkey=nav_feed.public_key)
+    )
+    yield app
+    dispose_engine()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from flask import Blueprint, Flask, jsonify
+
+from app.admission import AdmissionController, Overloaded, init_admission
+from app.config import AdmissionConfig
+
+
+def _wait_for(condition, timeout_s: float = 2.0) -> bool:
+    """Poll ``condition`` until it holds or the deadline passes, so a regression fails instead of hanging."""
+
+    deadline = time.monotonic() + timeout_s
+    pause = threading.Event()
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        pause.wait(0.001)
+    return True
+
+
+def test_route_limit_sheds_after_queue_deadline_but_health_still_admitted(make_config):
+    controller = AdmissionController(make_config(AdmissionConfig))
+    ticket = controller.acquire("redeem")
+
+    with pytest.raises(Overloaded) as excinfo:
+        controller.acquire("redeem")
+    assert excinfo.value.reason == "queue_timeout"
+
+    health = controller.acquire("health")
+    controller.release(health)
+    controller.release(ticket)
+
+    snapshot = controller.snapshot()
+    assert snapshot["shedTotal"] == 1
+    assert snapshot["routes"]["redeem"]["shed"] == 1
+    assert snapshot["inFlight"] == 0
+
+
+def test_critical_reserve_keeps_verify_open_when_global_limit_is_reached(make_config):
+    controller = AdmissionController(make_config(AdmissionConfig, route_limits={}, queue_size=0))
+    tickets = [controller.acquire("mint") for _ in range(3)]
+
+    with pytest.raises(Overloaded) as excinfo:
+        controller.acquire("mint")
+    assert excinfo.value.reason == "queue_full"
+
+    # Ticket polling is not critical: it must not take the slots held back for /health and /verify.
+    with pytest.raises(Overloaded):
+        controller.acquire("redeem_status")
+
+    verify = controller.acquire("verify")
+    for ticket in tickets + [verify]:
+        controller.release(ticket)
+
+
+def test_queued_request_is_admitted_when_a_slot_frees(make_config):
+    controller = AdmissionController(make_config(AdmissionConfig, queue_timeout_s=2))
+    first = controller.acquire("redeem")
+    admitted = threading.Event()
+
+    def waiter():
+        controller.release(controller.acquire("redeem"))
+        admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    assert _wait_for(lambda: controller.snapshot()["queueDepth"] > 0)
+    controller.release(first)
+    thread.join(timeout=2)
+
+    assert admitted.is_set()
+    assert controller.snapshot()["routes"]["redeem"]["admitted"] == 2
+
+
+def test_full_queue_evicts_the_newest_lowest_priority_waiter_for_a_critical_request(make_config):
+    config = make_config(AdmissionConfig, global_limit=1, critical_reserve=0, queue_size=1, queue_timeout_s=2)
+    controller = AdmissionController(config)
+    held = controller.acquire("mint")
+    outcomes = {}
+
+    def request(route):
+        try:
+            controller.release(controller.acquire(route))
+            outcomes[route] = "admitted"
+        except Overloaded as exc:
+            outcomes[route] = exc.reason
+
+    queued = threading.Thread(target=request, args=("redeem",))
+    queued.start()
+    assert _wait_for(lambda: controller.snapshot()["queueDepth"] == 1)
+
+    # A newcomer no more urgent than anything queued is the one turned away.
+    with pytest.raises(Overloaded) as excinfo:
+        controller.acquire("import_affidavits")
+    assert excinfo.value.reason == "queue_full"
+
+    critical = threading.Thread(target=request, args=("verify",))
+    critical.start()
+    queued.join(timeout=2)
+    assert outcomes == {"redeem": "queue_evicted"}
+
+    controller.release(held)
+    critical.join(timeout=2)
+    assert outcomes == {"redeem": "queue_evicted", "verify": "admitted"}
+    snapshot = controller.snapshot()
+    assert (snapshot["shedTotal"], snapshot["routes"]["redeem"]["shed"], snapshot["queueDepth"]) == (2, 1, 0)
+
+
+def test_adaptive_limit_backs_off_when_latency_rises(make_config):
+    controller = AdmissionController(make_config(AdmissionConfig, adaptive=True, route_limits={"redeem": 10}))
+    state = controller._route("redeem")
+
+    for latency in [10.0] * 20:
+        state.observe(latency, tolerance=2.0)
+    assert state.limit == 11
+
+    for latency in [100.0] * 20:
+        state.observe(latency, tolerance=2.0)
+    assert state.limit < 11
+
+
+def test_overloaded_requests_get_503_with_retry_after(make_config):
+    app = Flask(__name__)
+    bp = Blueprint("sovereign", __name__)
+    gate = threading.Event()
+
+    @bp.post("/redeem")
+    def redeem():
+        gate.wait(2)
+        return jsonify({"ok": True})
+
+    @bp.get("/health")
+    def health():
+        return jsonify({"ok": True})
+
+    init_admission(app, make_config(AdmissionConfig, queue_size=0))
+    app.register_blueprint(bp)
+
+    results = []
+    blocker = threading.Thread(target=lambda: results.append(app.test_client().post("/redeem").status_code))
+    blocker.start()
+    assert _wait_for(lambda: app.extensions["admission"].snapshot()["inFlight"] > 0)
+
+    client = app.test_client()
+    shed = client.post("/redeem")
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "3"
+    assert shed.get_json()["reason"] == "queue_full"
+    assert client.get("/health").status_code == 200
+
+    gate.set()
+    blocker.join(timeout=2)
+    assert results == [200]
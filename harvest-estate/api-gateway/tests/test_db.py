@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+
+from app.db import session_scope
+from app.models import LedgerLog, LogLevel
+
+
+def test_in_memory_sessions_are_serialized_so_a_rollback_keeps_other_writes(app):
+    started = threading.Event()
+    errors = []
+
+    def writer():
+        with session_scope() as session:
+            session.add(LedgerLog(scope="test:writer", level=LogLevel.INFO, message="kept"))
+            session.flush()
+            started.set()
+            # Give the failing session time to run on the shared connection if it is not blocked.
+            threading.Event().wait(0.1)
+
+    def failing():
+        started.wait(2)
+        try:
+            with session_scope() as session:
+                session.add(LedgerLog(scope="test:failing", level=LogLevel.INFO, message="dropped"))
+                session.flush()
+                raise RuntimeError("request failed")
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=failing)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(errors) == 1
+    with session_scope() as session:
+        scopes = {scope for (scope,) in session.query(LedgerLog.scope).filter(LedgerLog.scope.like("test:%"))}
+    assert scopes == {"test:writer"}
+
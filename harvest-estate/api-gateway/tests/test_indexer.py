@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from eth_abi import encode
+from web3 import Web3
+
+from app.config import IndexerConfig
+from app.db import session_scope
+from app.indexer import MODULE_EVENTS, ChainIndexer, RangeSizer, _EventDecoder
+from app.models import IndexerCursor, LedgerLog, Transaction, TransactionType
+
+HRVST_ADDRESS = "0x00000000000000000000000000000000000000a1"
+HOLDER = "0x00000000000000000000000000000000000000b2"
+# One value per non-integer ABI type used by MODULE_EVENTS; integers take their argument position.
+SAMPLE_ARGS = {"address": HOLDER, "bytes32": b"\x44" * 32, "string": "HAS-ALPHA", "bool": True}
+
+
+def _mint_log(block_number: int = 7, log_index: int = 0, block_hash: bytes = b"\x11" * 32) -> dict:
+    topic = Web3.keccak(text="MintByNAV(address,uint256,uint256,uint256,uint256)")
+    return {
+        "address": Web3.to_checksum_address(HRVST_ADDRESS),
+        "topics": [topic, bytes(12) + bytes.fromhex(HOLDER[2:])],
+        "data": encode(["uint256"] * 4, [5 * 10**18, 100, 200, 8_500]),
+        "blockNumber": block_number,
+        "blockHash": block_hash,
+        "transactionHash": b"\x22" * 32,
+        "transactionIndex": 0,
+        "logIndex": log_index,
+    }
+
+
+def test_range_sizer_grows_on_sparse_windows_and_shrinks_on_dense_ones():
+    sizer = RangeSizer(size=100, minimum=10, maximum=400, target_logs=50)
+
+    sizer.record(0)
+    assert sizer.size == 200
+    sizer.record(0)
+    sizer.record(0)
+    assert sizer.size == 400
+
+    sizer.record(500)
+    assert sizer.size == 200
+
+    assert sizer.plan(1, 450, 3) == [(1, 200), (201, 400), (401, 450)]
+
+
+def test_fetch_window_splits_ranges_the_node_rejects(make_config):
+    calls = []
+
+    def get_logs(params):
+        calls.append((params["fromBlock"], params["toBlock"]))
+        if params["toBlock"] - params["fromBlock"] + 1 > 25:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+        return [params["fromBlock"]]
+
+    indexer = ChainIndexer(make_config(IndexerConfig), w3=Web3(), get_logs=get_logs)
+    result = indexer._fetch_window((0, 99))
+
+    assert result.logs == [0, 25, 50, 75]
+    assert result.splits == 3
+    assert calls[0] == (0, 99)
+
+
+def test_fetch_window_raises_once_below_minimum_range(make_config):
+    def get_logs(_params):
+        raise ValueError("block range too wide")
+
+    indexer = ChainIndexer(make_config(IndexerConfig, min_range=50), w3=Web3(), get_logs=get_logs)
+    with pytest.raises(ValueError):
+        indexer._fetch_window((0, 99))
+
+
+def test_decode_maps_mint_by_nav_to_ledger_and_transaction_rows(make_config):
+    indexer = ChainIndexer(make_config(IndexerConfig), w3=Web3(), get_logs=lambda _params: [])
+
+    event = indexer.decode(_mint_log())
+    assert event is not None
+    assert event.kind == "MintByNAV"
+    assert event.event_uid == f"0x{'22' * 32}:0"
+    assert event.payload["amount"] == str(5 * 10**18)
+    assert event.payload["to"].lower() == HOLDER
+
+    ledger_rows, transaction_rows = indexer.build_rows([event], asset_ids={})
+    assert ledger_rows[0]["scope"] == "chain:hrvst"
+    assert ledger_rows[0]["metadata_payload"]["blockNumber"] == 7
+    assert transaction_rows[0]["type"] is TransactionType.MINT
+    assert transaction_rows[0]["amount_usd"] == Decimal("5")
+
+
+def test_decoder_matches_web3_process_log_for_every_module_event():
+    for module, events in MODULE_EVENTS.items():
+        for abi_event in events:
+            contract = Web3().eth.contract(address=Web3.to_checksum_address(HRVST_ADDRESS), abi=[abi_event])
+            inputs = abi_event["inputs"]
+            args = [SAMPLE_ARGS.get(arg["type"], position + 1) for position, arg in enumerate(inputs)]
+            indexed = [(arg, value) for arg, value in zip(inputs, args) if arg["indexed"]]
+            data = [(arg, value) for arg, value in zip(inputs, args) if not arg["indexed"]]
+            topic_signature = f"{abi_event['name']}({','.join(arg['type'] for arg in inputs)})"
+            log = {
+                "address": Web3.to_checksum_address(HRVST_ADDRESS),
+                "topics": [Web3.keccak(text=topic_signature)]
+                + [
+                    Web3.keccak(text=value) if arg["type"] == "string" else encode([arg["type"]], [value])
+                    for arg, value in indexed
+                ],
+                "data": encode([arg["type"] for arg, _ in data], [value for _, value in data]),
+                "blockNumber": 7,
+                "blockHash": b"\x11" * 32,
+                "transactionHash": b"\x22" * 32,
+                "transactionIndex": 0,
+                "logIndex": 0,
+                "removed": False,
+            }
+
+            expected = dict(getattr(contract.events, abi_event["name"])().process_log(log)["args"])
+            decoded = _EventDecoder.from_abi(abi_event).decode(log["topics"], log["data"])
+            assert decoded == expected, f"{module}:{abi_event['name']}"
+
+
+def test_decode_ignores_logs_from_unknown_contracts(make_config):
+    indexer = ChainIndexer(make_config(IndexerConfig), w3=Web3(), get_logs=lambda _params: [])
+    log = _mint_log()
+    log["address"] = Web3.to_checksum_address("0x00000000000000000000000000000000000000c3")
+
+    assert indexer.decode(log) is None
+
+
+def _commit_logs(indexer, logs, end_block, end_hash):
+    return indexer._commit([indexer.decode(log) for log in logs], end_block, end_hash)
+
+
+def _chain_block_numbers():
+    with session_scope() as session:
+        ledger = session.query(LedgerLog).filter(LedgerLog.scope.like("chain:%")).all()
+        chain_transactions = (
+            session.query(Transaction).filter(Transaction.metadata_payload["source"].as_string() == "chain").all()
+        )
+        assert all(row.chain_block == row.metadata_payload["blockNumber"] for row in ledger + chain_transactions)
+    return (
+        [row.chain_block for row in ledger],
+        [row.chain_block for row in chain_transactions],
+    )
+
+
+def test_reorg_rewinds_cursor_to_last_canonical_event_block(app, monkeypatch, make_config):
+    indexer = ChainIndexer(make_config(IndexerConfig, confirmations=5), w3=Web3(), get_logs=lambda _params: [])
+    indexer._load_cursor()
+    _commit_logs(indexer, [_mint_log(block_number=3), _mint_log(block_number=18, log_index=1)], 20, "0xaa")
+    canonical = {3: f"0x{'11' * 32}"}
+    monkeypatch.setattr(indexer, "_block_hash", lambda block: canonical.get(block, "0xbb"))
+
+    assert indexer.check_reorg()
+
+    assert indexer._load_cursor() == (3, canonical[3])
+    assert _chain_block_numbers() == ([3], [3])
+
+
+def test_reorg_deeper_than_confirmations_walks_back_to_a_canonical_checkpoint(app, monkeypatch, make_config):
+    indexer = ChainIndexer(make_config(IndexerConfig, confirmations=2), w3=Web3(), get_logs=lambda _params: [])
+    indexer._load_cursor()
+    _commit_logs(indexer, [_mint_log(block_number=3)], 10, "0x0a")
+    orphaned = b"\x33" * 32
+    _commit_logs(
+        indexer,
+        [_mint_log(block_number=12, block_hash=orphaned), _mint_log(block_number=18, log_index=1, block_hash=orphaned)],
+        20,
+        "0xaa",
+    )
+    # Everything above block 10 was replaced; the old cursor is 10 blocks past the rewind depth.
+    canonical = {3: f"0x{'11' * 32}", 10: "0x0a"}
+    monkeypatch.setattr(indexer, "_block_hash", lambda block: canonical.get(block, "0xbb"))
+
+    assert indexer.check_reorg()
+
+    assert indexer._load_cursor() == (10, "0x0a")
+    assert _chain_block_numbers() == ([3], [3])
+    assert not indexer.check_reorg()
+
+
+def test_backfill_plans_waves_from_sizer_feedback_and_advances_the_cursor(app, make_config):
+    calls = []
+
+    def get_logs(params):
+        calls.append((params["fromBlock"], params["toBlock"]))
+        return [_mint_log(block_number=block) for block in (40, 260) if params["fromBlock"] <= block <= params["toBlock"]]
+
+    config = make_config(IndexerConfig, start_block=1, confirmations=0, range_size=50, max_range=200, concurrency=2)
+    indexer = ChainIndexer(config, w3=Web3(), cursor_name="backfill", get_logs=get_logs)
+    indexer.sizer.target_logs = 4
+    hashes = []
+    indexer._block_hash = lambda block: hashes.append(block) or f"0x{block:064x}"
+    indexer.safe_head = lambda: 500
+
+    stats = indexer.backfill(to_block=350)
+
+    # Both sparse first-wave windows double the size, so the second wave covers 250 blocks in two calls.
+    assert sorted(calls) == [(1, 50), (51, 100), (101, 300), (301, 350)]
+    assert hashes == [100, 350]
+    assert indexer.sizer.size == 200
+    assert (stats.from_block, stats.to_block, stats.windows, stats.logs, stats.events) == (1, 350, 4, 2, 2)
+    assert stats.as_dict()["blocksPerSecond"] > 0
+    assert indexer._load_cursor() == (350, f"0x{350:064x}")
+    assert _chain_block_numbers() == ([40, 260], [40, 260])
+    with session_scope() as session:
+        assert session.get(IndexerCursor, "backfill").recent_blocks == [[100, f"0x{100:064x}"], [350, f"0x{350:064x}"]]
+
+    calls.clear()
+    assert indexer.run_once(to_block=350).blocks == 0
+    assert calls == []
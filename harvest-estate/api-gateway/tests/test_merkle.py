@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from app.merkle import affidavit_leaf, all_proofs, build_levels, keccak256, proof, split_proof, verify_proof
+
+
+def _leaves(count: int):
+    return [affidavit_leaf(hashlib.sha256(str(index).encode()).hexdigest()) for index in range(count)]
+
+
+def test_two_leaf_root_hashes_the_sorted_pair():
+    left, right = _leaves(2)
+
+    levels = build_levels([left, right])
+
+    assert levels[-1] == keccak256(min(left, right) + max(left, right))
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 64, 1000])
+def test_every_leaf_proof_verifies_against_the_root(count):
+    leaves = _leaves(count)
+    levels = build_levels(leaves)
+    proofs = all_proofs(levels)
+
+    assert len(proofs) == count
+    for index, leaf in enumerate(leaves):
+        assert proofs[index] == proof(levels, index)
+        assert len(split_proof(proofs[index])) <= (count - 1).bit_length()
+        assert verify_proof(leaf, proofs[index], levels[-1])
+
+
+def test_tampered_proof_or_foreign_leaf_does_not_verify():
+    leaves = _leaves(9)
+    levels = build_levels(leaves)
+    packed = proof(levels, 4)
+
+    assert not verify_proof(leaves[5], packed, levels[-1])
+    assert not verify_proof(leaves[4], bytes(32) + packed[32:], levels[-1])
+
+
+def test_affidavit_leaf_hashes_hex_digests_as_raw_bytes():
+    digest = hashlib.sha256(b"affidavit").hexdigest()
+
+    assert affidavit_leaf(digest) == keccak256(bytes.fromhex(digest))
+    assert affidavit_leaf("0x" + digest) == affidavit_leaf(digest)
+    assert affidavit_leaf("hash-42") == keccak256(b"hash-42")
+
+
+def test_build_levels_rejects_empty_batches():
+    with pytest.raises(ValueError):
+        build_levels([])
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.models import AssetType
+from app.nav import NavSnapshotError, compute_revaluation, parse_signed_snapshot, verify_nav_snapshot
+
+
+def _snapshot(**overrides):
+    payload = {"timestamp": 1_700_000_000, "navCsdn": "3000", "navSdn": "500", "floorBps": 8_500, "price": "1"}
+    payload.update(overrides)
+    return parse_signed_snapshot({"payload": payload, "signature": ""})
+
+
+def test_verify_nav_snapshot_accepts_feed_signature_and_rejects_tampering(nav_feed):
+    signed = nav_feed.sign(navCsdn="100", navSdn="50", floorBps=1000)
+
+    verify_nav_snapshot(parse_signed_snapshot(signed), nav_feed.public_key)
+
+    signed["payload"]["navCsdn"] = "1000"
+    with pytest.raises(NavSnapshotError, match="nav_signature_invalid"):
+        verify_nav_snapshot(parse_signed_snapshot(signed), nav_feed.public_key)
+
+
+def test_parse_signed_snapshot_rejects_out_of_range_floor():
+    with pytest.raises(NavSnapshotError, match="nav_snapshot_out_of_range"):
+        _snapshot(floorBps=10_001)
+
+
+def test_compute_revaluation_weights_class_nav_by_asset_valuation():
+    rows = [
+        (1, 10, AssetType.CSDN, Decimal("200"), Decimal("100"), Decimal("1")),
+        (2, 10, AssetType.CSDN, Decimal("200"), Decimal("100"), Decimal("1")),
+        (3, 11, AssetType.CSDN, Decimal("100"), Decimal("50"), Decimal("1")),
+        (4, 20, AssetType.SDN, Decimal("0"), Decimal("250"), Decimal("1")),
+    ]
+
+    result = compute_revaluation(rows, _snapshot(), decimals=0)
+
+    # Asset 10 holds 2/3 of CSDN valuation over 200 tokens; asset 11 holds 1/3 over 50.
+    assert result.nav_per_token[:3] == [Decimal("10.00000000")] * 2 + [Decimal("20.00000000")]
+    # SDN has no valuation recorded, so NAV is spread flat across its tokens.
+    assert result.nav_per_token[3] == Decimal("2.00000000")
+    assert result.policy_floor[0] == Decimal("8.50000000")
+    assert result.issuance_ids == [1, 2, 3, 4]
+
+
+def test_compute_revaluation_scales_feed_units():
+    rows = [(1, 10, AssetType.CSDN, Decimal("1"), Decimal("3"), Decimal("0"))]
+
+    result = compute_revaluation(rows, _snapshot(navCsdn=str(6 * 10**18)), decimals=18)
+
+    assert result.nav_per_token == [Decimal("2.00000000")]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import socket
+import threading
+from dataclasses import replace
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+import requests
+
+from app import redemptions
+from app.config import load_redemption_worker_config
+from app.db import session_scope
+from app.models import RedemptionJob, RedemptionJobStatus, Transaction, TransactionType
+from app.redemptions import (
+    RedemptionOutcome,
+    RedemptionWorker,
+    apply_outcomes,
+    claim_batch,
+    enqueue_redemption,
+    submit_redemptions,
+)
+
+
+def _job(job_id: int = 7, attempts: int = 1, tokens: str = "1500") -> RedemptionJob:
+    return RedemptionJob(
+        id=job_id,
+        ticket=f"t-{job_id}",
+        external_id="HAS-ALPHA",
+        holder_id=f"HOLDER-{job_id}",
+        tokens=Decimal(tokens),
+        attempts=attempts,
+    )
+
+
+def test_submit_redemptions_sends_the_batch_in_one_call_and_maps_results_in_order(se7en):
+    se7en.respond = lambda _url, _payload: (
+        200,
+        {"ok": True, "results": [{"ok": True, "usdPaid": 1234.5}, {"ok": False, "error": "insufficient_supply"}]},
+    )
+
+    outcomes = submit_redemptions(se7en, "http://se7en:4000", [_job(7), _job(8, tokens="2.5")], max_attempts=3)
+
+    assert se7en.calls == [
+        (
+            "http://se7en:4000/treasury/redeem/batch",
+            {"redemptions": [{"holderId": "HOLDER-7", "tokens": 1500}, {"holderId": "HOLDER-8", "tokens": 2.5}]},
+        )
+    ]
+    assert [(outcome.job_id, outcome.status) for outcome in outcomes] == [
+        (7, RedemptionJobStatus.COMPLETED),
+        (8, RedemptionJobStatus.REJECTED),
+    ]
+    assert outcomes[0].result == {"ok": True, "usdPaid": 1234.5, "source": "se7en"}
+    assert all(outcome.settled for outcome in outcomes)
+
+
+def test_submit_redemptions_rejects_every_job_when_se7en_refuses_the_batch(se7en):
+    se7en.respond = lambda _url, _payload: (400, {"ok": False, "error": "treasury_uninitialized"})
+
+    outcomes = submit_redemptions(se7en, "http://se7en", [_job(7), _job(8)], max_attempts=3)
+
+    assert {outcome.status for outcome in outcomes} == {RedemptionJobStatus.REJECTED}
+    assert {outcome.http_status for outcome in outcomes} == {400}
+
+
+def test_submit_redemptions_fails_for_review_when_results_do_not_line_up(se7en):
+    se7en.respond = lambda _url, _payload: (200, {"ok": True, "results": [{"ok": True}]})
+
+    outcomes = submit_redemptions(se7en, "http://se7en", [_job(7), _job(8)], max_attempts=3)
+
+    assert {(outcome.status, outcome.error) for outcome in outcomes} == {
+        (RedemptionJobStatus.FAILED, "se7en_invalid_response")
+    }
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_submit_redemptions_requeues_refused_connections_until_attempts_run_out():
+    url = f"http://127.0.0.1:{_closed_port()}"
+    with requests.Session() as http:
+        outcomes = submit_redemptions(http, url, [_job(7, attempts=1), _job(8, attempts=3)], 3, timeout_s=2)
+
+    assert [outcome.status for outcome in outcomes] == [RedemptionJobStatus.QUEUED, RedemptionJobStatus.FAILED]
+
+
+def test_submit_redemptions_fails_when_connection_drops_after_the_request_was_sent():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+
+    def drop_after_reading_body():
+        conn, _ = server.accept()
+        conn.recv(65536)
+        conn.close()
+
+    thread = threading.Thread(target=drop_after_reading_body, daemon=True)
+    thread.start()
+    with requests.Session() as http, server:
+        [outcome] = submit_redemptions(http, f"http://127.0.0.1:{server.getsockname()[1]}", [_job()], 3, timeout_s=2)
+    thread.join(timeout=2)
+
+    assert outcome.status is RedemptionJobStatus.FAILED
+    assert outcome.error.startswith("se7en_connection_lost")
+
+
+def test_submit_redemptions_fails_on_timeouts_because_outcome_is_unknown(se7en):
+    se7en.respond = lambda _url, _payload: requests.ReadTimeout("slow")
+
+    [outcome] = submit_redemptions(se7en, "http://se7en", [_job()], max_attempts=3)
+
+    assert outcome.status is RedemptionJobStatus.FAILED
+    assert not outcome.settled
+
+
+def test_outcome_is_not_written_over_a_job_another_worker_failed_for_lease_expiry(app):
+    config = load_redemption_worker_config()
+    with session_scope() as session:
+        enqueue_redemption(session, "HAS-ALPHA", "H-1", Decimal("10"))
+    with session_scope() as session:
+        [job] = claim_batch(session, config.batch_size, config.lease_s)
+    claimed_at = job.claimed_at
+    with session_scope() as session:
+        claim_batch(session, config.batch_size, config.lease_s, now=claimed_at + timedelta(seconds=config.lease_s + 1))
+
+    completed = RedemptionOutcome(job.id, RedemptionJobStatus.COMPLETED, 200, {"ok": True, "source": "se7en"})
+    with session_scope() as session:
+        apply_outcomes(session, [job], [completed], claimed_at)
+
+    with session_scope() as session:
+        stored = session.get(RedemptionJob, job.id)
+        assert (stored.status, stored.error) == (RedemptionJobStatus.FAILED, "lease_expired")
+        assert session.query(Transaction).filter(Transaction.type == TransactionType.REDEMPTION).count() == 0
+
+
+def test_worker_hands_back_a_batch_without_sending_when_too_little_lease_is_left(app, se7en, monkeypatch):
+    config = load_redemption_worker_config()
+    with session_scope() as session:
+        ticket = enqueue_redemption(session, "HAS-ALPHA", "H-1", Decimal("10")).ticket
+
+    def claim_late(session, batch_size, lease_s):
+        late = redemptions._lease_clock() - timedelta(seconds=lease_s - config.timeout_s / 2)
+        return claim_batch(session, batch_size, lease_s, now=late)
+
+    monkeypatch.setattr(redemptions, "claim_batch", claim_late)
+    worker = RedemptionWorker(config, "http://se7en", http=se7en)
+    assert worker.run_once() == 1
+
+    assert se7en.calls == []
+    with session_scope() as session:
+        job = session.query(RedemptionJob).filter(RedemptionJob.ticket == ticket).one()
+        assert (job.status, job.error, job.claimed_at) == (
+            RedemptionJobStatus.QUEUED,
+            "lease_expired_before_submit",
+            None,
+        )
+
+
+def test_worker_rejects_leases_shorter_than_a_se7en_call():
+    config = load_redemption_worker_config()
+
+    with pytest.raises(ValueError, match="REDEMPTION_LEASE_S"):
+        RedemptionWorker(replace(config, lease_s=config.timeout_s), "http://se7en")
+    with pytest.raises(ValueError, match="REDEMPTION_BATCH_SIZE"):
+        RedemptionWorker(replace(config, batch_size=redemptions.SE7EN_MAX_BATCH + 1), "http://se7en")
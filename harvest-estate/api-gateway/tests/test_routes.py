@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from app import routes
+from app.affidavits import seal_batch
+from app.config import load_affidavit_batch_config, load_redemption_worker_config
+from app.db import session_scope
+from app.fixtures import HASKINS_AFFIDAVIT_HASH
+from app.models import Issuance, LedgerLog, NavFeedCursor, RedemptionJob, Transaction, TransactionType
+from app.redemptions import RedemptionWorker
+from app.serialization import serialize_affidavit_batch
+
+
+def test_verify_returns_seeded_affidavit_and_asset(client):
+    response = client.get(f"/verify/{HASKINS_AFFIDAVIT_HASH}")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["attestation"]["clauseRef"] == "EYEION-2024-ALPHA"
+    assert body["asset"]["externalId"] == "HAS-ALPHA"
+    assert client.get("/verify/unknown").status_code == 404
+
+
+def test_intake_to_circulation_workflow_writes_json_metadata(client):
+    assert client.post("/intake", json={"externalId": "EST-1", "name": "Estate One", "valuationUsd": 500000}).status_code == 200
+    assert client.post("/insurance", json={"externalId": "EST-1", "multiplier": 2, "coverageUsd": 1000000}).status_code == 200
+    minted = client.post("/mint", json={"externalId": "EST-1", "quantity": 1000, "navPerToken": 0.9})
+    circulated = client.post("/circulate", json={"externalId": "EST-1", "amountUsd": 250000})
+
+    assert minted.get_json()["transaction"]["metadata"]["navPerToken"] == "0.9"
+    assert circulated.get_json()["asset"]["status"] == "CIRCULATING"
+    with session_scope() as session:
+        logs = session.query(LedgerLog).filter(LedgerLog.scope == "workflow:est-1").all()
+        assert [log.user.role.value for log in logs] == ["LAW", "INSURANCE", "TREASURY", "OPS"]
+        assert logs[-1].metadata_payload == {"amountUsd": "250000", "tenorDays": 90}
+
+
+def test_async_redemption_is_processed_by_worker(client, se7en):
+    queued = client.post("/redeem", json={"externalId": "HAS-ALPHA", "holderId": "H-1", "tokens": 10, "async": True})
+    assert queued.status_code == 202
+    ticket = queued.get_json()["ticket"]
+
+    worker = RedemptionWorker(load_redemption_worker_config(), "http://se7en", http=se7en)
+    assert worker.drain() == 1
+    worker.close()
+
+    redemption = client.get(f"/redeem/{ticket}").get_json()["redemption"]
+    assert redemption["status"] == "COMPLETED"
+    assert redemption["result"] == {"ok": True, "usdPaid": 910.0, "source": "se7en"}
+    with session_scope() as session:
+        tx = session.query(Transaction).filter(Transaction.type == TransactionType.REDEMPTION).one()
+        assert tx.metadata_payload["ticket"] == ticket
+
+
+def test_async_redemption_validates_before_queueing(client):
+    base = {"externalId": "HAS-ALPHA", "holderId": "H-1", "tokens": 10, "async": True}
+    cases = [
+        ({"tokens": "NaN"}, 400, "invalid_tokens"),
+        ({"tokens": "Infinity"}, 400, "invalid_tokens"),
+        ({"tokens": -5}, 400, "invalid_tokens"),
+        ({"async": "false"}, 400, "invalid_async"),
+        ({"externalId": "NOPE"}, 404, "asset_not_found"),
+    ]
+
+    for overrides, status, error in cases:
+        response = client.post("/redeem", json={**base, **overrides})
+        assert (response.status_code, response.get_json()["error"]) == (status, error)
+    with session_scope() as session:
+        assert session.query(RedemptionJob).count() == 0
+
+
+def test_inline_redemption_records_transaction(client, monkeypatch, se7en):
+    monkeypatch.setattr(routes.requests, "post", se7en.post)
+
+    response = client.post("/redeem", json={"externalId": "MER-BETA", "holderId": "H-2", "tokens": 5})
+
+    assert response.get_json() == {"ok": True, "usdPaid": 910.0, "source": "se7en"}
+    with session_scope() as session:
+        tx = session.query(Transaction).filter(Transaction.type == TransactionType.REDEMPTION).one()
+        assert tx.metadata_payload == {"holderId": "H-2", "status": True}
+
+
+def test_nav_revaluation_updates_issuances(client, nav_feed):
+    response = client.post("/nav/revalue", json=nav_feed.sign())
+
+    assert response.get_json()["updated"] == 2
+    with session_scope() as session:
+        updates = session.query(Transaction).filter(Transaction.type == TransactionType.NAV_UPDATE).count()
+        navs = {
+            token_quantity: (round(nav, 4), round(floor, 4))
+            for token_quantity, nav, floor in session.query(
+                Issuance.quantity, Issuance.nav_per_token, Issuance.policy_floor
+            )
+        }
+        assert updates == 2
+        assert navs[Decimal("380038.75")] == (Decimal("1.0000"), Decimal("0.8500"))
+        assert navs[Decimal("248000.00")] == (Decimal("0.9000"), Decimal("0.7650"))
+
+
+def test_nav_revaluation_rejects_replayed_and_older_snapshots(client, nav_feed):
+    signed = nav_feed.sign()
+    assert client.post("/nav/revalue", json=signed).status_code == 200
+
+    replayed = client.post("/nav/revalue", json=signed)
+    older = client.post("/nav/revalue", json=nav_feed.sign(navCsdn="1", timestamp=1_750_000_000))
+
+    assert (replayed.status_code, replayed.get_json()["error"]) == (409, "nav_snapshot_replayed")
+    assert (older.status_code, older.get_json()["error"]) == (409, "nav_snapshot_stale")
+    with session_scope() as session:
+        assert session.query(Transaction).filter(Transaction.type == TransactionType.NAV_UPDATE).count() == 2
+        assert {round(nav, 4) for (nav,) in session.query(Issuance.nav_per_token)} == {
+            Decimal("1.0000"),
+            Decimal("0.9000"),
+        }
+
+
+def test_nav_revaluation_limited_to_one_asset_type_leaves_the_other_free_to_apply_it(client, nav_feed):
+    signed = nav_feed.sign()
+
+    csdn = client.post("/nav/revalue", json={**signed, "assetTypes": ["CSDN"]})
+    sdn = client.post("/nav/revalue", json={**signed, "assetTypes": ["SDN"]})
+    everything = client.post("/nav/revalue", json=signed)
+
+    assert [csdn.get_json()["updated"], sdn.get_json()["updated"]] == [1, 1]
+    assert (everything.status_code, everything.get_json()["error"]) == (409, "nav_snapshot_replayed")
+    with session_scope() as session:
+        assert {round(nav, 4) for (nav,) in session.query(Issuance.nav_per_token)} == {
+            Decimal("1.0000"),
+            Decimal("0.9000"),
+        }
+        cursors = {cursor.name: cursor.last_digest for cursor in session.query(NavFeedCursor)}
+        assert cursors == {"nav_feed:CSDN": csdn.get_json()["snapshotDigest"], "nav_feed:SDN": sdn.get_json()["snapshotDigest"]}
+
+
+def test_nav_revaluation_rejects_malformed_asset_types(client, nav_feed):
+    for asset_types in ([1], "CSDN", ["BOND"]):
+        signed = {**nav_feed.sign(), "assetTypes": asset_types}
+        response = client.post("/nav/revalue", json=signed)
+        assert (response.status_code, response.get_json()["error"]) == (400, "invalid_asset_type")
+
+
+def test_imported_affidavits_verify_with_inclusion_proofs_once_the_batcher_seals_them(client):
+    records = [
+        {
+            "externalId": "MER-BETA",
+            "hash": f"0x{index:064x}",
+            "jurisdiction": "US-CA",
+            "clauseRef": f"EYEION-BULK-{index}",
+            "issuedBy": "Eyeion Legal Chain",
+        }
+        for index in range(1, 6)
+    ]
+
+    imported = client.post("/affidavits/import", json={"affidavits": records + records[:2]}).get_json()
+
+    assert imported == {"ok": True, "inserted": 5, "duplicates": 2}
+    assert client.get(f"/verify/{records[2]['hash']}").get_json()["inclusion"] is None
+
+    with session_scope() as session:
+        batch = serialize_affidavit_batch(seal_batch(session, load_affidavit_batch_config().max_leaves))
+        assert seal_batch(session, load_affidavit_batch_config().max_leaves) is None
+    assert batch["leafCount"] == 7  # the two seeded affidavits join the first batch
+
+    inclusion = client.get(f"/verify/{records[2]['hash']}").get_json()["inclusion"]
+    assert inclusion["root"] == batch["root"]
+    assert inclusion["valid"] and not inclusion["anchored"]
+    assert len(inclusion["proof"]) == batch["depth"]
+
+    anchor_url = f"/affidavits/batches/{batch['id']}/anchor"
+    tx_hash = f"0x{'fe' * 32}"
+    anchored = client.post(anchor_url, json={"txHash": tx_hash})
+    assert anchored.get_json()["batch"]["anchorTxHash"] == tx_hash
+    assert client.get(f"/verify/{HASKINS_AFFIDAVIT_HASH}").get_json()["inclusion"]["anchored"]
+
+    # Replaying the same anchor is harmless; a different transaction must not replace it.
+    assert client.post(anchor_url, json={"txHash": tx_hash.upper().replace("0X", "0x")}).status_code == 200
+    conflict = client.post(anchor_url, json={"txHash": f"0x{'ab' * 32}"})
+    assert conflict.status_code == 409
+    assert conflict.get_json() == {"ok": False, "error": "already_anchored", "anchorTxHash": tx_hash}
+
+
+def test_affidavit_anchor_rejects_malformed_transaction_hashes(client):
+    for tx_hash in ["0xfeed", "fe" * 32, f"0x{'zz' * 32}", 7]:
+        response = client.post("/affidavits/batches/1/anchor", json={"txHash": tx_hash})
+
+        assert (response.status_code, response.get_json()["error"]) == (400, "invalid_tx_hash")
+
+
+def test_affidavit_import_rejects_unknown_assets(client):
+    record = {"externalId": "NOPE", "hash": "0x01", "jurisdiction": "US", "clauseRef": "c", "issuedBy": "i"}
+
+    response = client.post("/affidavits/import", json={"affidavits": [record]})
+
+    assert response.status_code == 404
+    assert response.get_json()["externalIds"] == ["NOPE"]
+
+
+def test_affidavit_import_rejects_malformed_records(client):
+    record = {"externalId": "MER-BETA", "hash": "0x01", "jurisdiction": "US", "clauseRef": "c", "issuedBy": "i"}
+
+    for records, index in ((["x"], 0), ([record, {**record, "issuedBy": ["i"]}], 1), ([{**record, "hash": 1}], 0)):
+        response = client.post("/affidavits/import", json={"affidavits": records})
+        assert response.status_code == 400
+        assert response.get_json() == {"ok": False, "error": "missing_required_fields", "index": index}
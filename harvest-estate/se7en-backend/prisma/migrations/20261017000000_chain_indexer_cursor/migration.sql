@@ -0,0 +1,10 @@
+-- CreateTable
+CREATE TABLE "IndexerCursor" (
+    "name" TEXT NOT NULL,
+    "lastBlock" BIGINT NOT NULL DEFAULT 0,
+    "lastBlockHash" TEXT,
+    "recentBlocks" JSONB,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "IndexerCursor_pkey" PRIMARY KEY ("name")
+);
@@ -0,0 +1,9 @@
+-- CreateTable
+CREATE TABLE "NavFeedCursor" (
+    "name" TEXT NOT NULL,
+    "lastTimestamp" BIGINT NOT NULL,
+    "lastDigest" TEXT NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "NavFeedCursor_pkey" PRIMARY KEY ("name")
+);
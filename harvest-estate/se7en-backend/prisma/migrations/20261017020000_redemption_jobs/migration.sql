@@ -0,0 +1,28 @@
+-- CreateEnum
+CREATE TYPE "RedemptionJobStatus" AS ENUM ('QUEUED', 'PROCESSING', 'COMPLETED', 'REJECTED', 'FAILED');
+
+-- CreateTable
+CREATE TABLE "RedemptionJob" (
+    "id" SERIAL NOT NULL,
+    "ticket" TEXT NOT NULL,
+    "externalId" TEXT NOT NULL,
+    "holderId" TEXT NOT NULL,
+    "tokens" DECIMAL(65,30) NOT NULL,
+    "status" "RedemptionJobStatus" NOT NULL DEFAULT 'QUEUED',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "httpStatus" INTEGER,
+    "result" JSONB,
+    "error" TEXT,
+    "claimedAt" TIMESTAMP(3),
+    "completedAt" TIMESTAMP(3),
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "RedemptionJob_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "RedemptionJob_ticket_key" ON "RedemptionJob"("ticket");
+
+-- CreateIndex
+CREATE INDEX "RedemptionJob_status_id_idx" ON "RedemptionJob"("status", "id");
@@ -0,0 +1,20 @@
+-- CreateIndex
+CREATE INDEX "Issuance_assetId_createdAt_idx" ON "Issuance"("assetId", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "Transaction_assetId_occurredAt_idx" ON "Transaction"("assetId", "occurredAt");
+
+-- CreateIndex
+CREATE INDEX "Transaction_issuanceId_idx" ON "Transaction"("issuanceId");
+
+-- CreateIndex
+CREATE INDEX "Affidavit_assetId_idx" ON "Affidavit"("assetId");
+
+-- CreateIndex
+CREATE INDEX "User_role_idx" ON "User"("role");
+
+-- CreateIndex
+CREATE INDEX "LedgerLog_scope_createdAt_idx" ON "LedgerLog"("scope", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "LedgerLog_userId_idx" ON "LedgerLog"("userId");
@@ -0,0 +1,26 @@
+-- CreateTable
+CREATE TABLE "AffidavitBatch" (
+    "id" SERIAL NOT NULL,
+    "root" TEXT NOT NULL,
+    "leafCount" INTEGER NOT NULL,
+    "depth" INTEGER NOT NULL,
+    "anchorTxHash" TEXT,
+    "anchoredAt" TIMESTAMP(3),
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "AffidavitBatch_pkey" PRIMARY KEY ("id")
+);
+
+-- AlterTable
+ALTER TABLE "Affidavit" ADD COLUMN "batchId" INTEGER,
+ADD COLUMN "leafIndex" INTEGER,
+ADD COLUMN "merkleProof" BYTEA;
+
+-- CreateIndex
+CREATE UNIQUE INDEX "AffidavitBatch_root_key" ON "AffidavitBatch"("root");
+
+-- CreateIndex
+CREATE INDEX "Affidavit_batchId_id_idx" ON "Affidavit"("batchId", "id");
+
+-- AddForeignKey
+ALTER TABLE "Affidavit" ADD CONSTRAINT "Affidavit_batchId_fkey" FOREIGN KEY ("batchId") REFERENCES "AffidavitBatch"("id") ON DELETE SET NULL ON UPDATE CASCADE;
@@ -0,0 +1,18 @@
+-- AlterTable
+ALTER TABLE "LedgerLog" ADD COLUMN "chainBlock" BIGINT;
+
+-- AlterTable
+ALTER TABLE "Transaction" ADD COLUMN "chainBlock" BIGINT;
+
+-- Backfill rows the chain indexer wrote before the column existed.
+UPDATE "LedgerLog" SET "chainBlock" = (metadata->>'blockNumber')::BIGINT
+WHERE starts_with(scope, 'chain:') AND metadata->>'blockNumber' IS NOT NULL;
+
+UPDATE "Transaction" SET "chainBlock" = (metadata->>'blockNumber')::BIGINT
+WHERE metadata->>'source' = 'chain' AND metadata->>'blockNumber' IS NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "LedgerLog_chainBlock_idx" ON "LedgerLog"("chainBlock") WHERE "chainBlock" IS NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "Transaction_chainBlock_idx" ON "Transaction"("chainBlock") WHERE "chainBlock" IS NOT NULL;
@@ -0,0 +1,9 @@
+-- /nav/revalue keeps one cursor per asset type ("nav_feed:CSDN", "nav_feed:SDN") so a run
+-- limited by assetTypes does not block the other types. Both start from the global cursor.
+INSERT INTO "NavFeedCursor" ("name", "lastTimestamp", "lastDigest", "updatedAt")
+SELECT 'nav_feed:' || asset_type::TEXT, "lastTimestamp", "lastDigest", "updatedAt"
+FROM "NavFeedCursor" CROSS JOIN unnest(enum_range(NULL::"AssetType")) AS asset_type
+WHERE "name" = 'nav_feed'
+ON CONFLICT ("name") DO NOTHING;
+
+DELETE FROM "NavFeedCursor" WHERE "name" = 'nav_feed';
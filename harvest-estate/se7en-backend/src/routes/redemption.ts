@@ -2,7 +2,7 @@ import { FastifyInstance } from 'fastify';
 import { Prisma, PrismaClient } from '@prisma/client';
 import { z } from 'zod';
 import { computeNav } from '../treasury/nav';
-import { quoteRedemption } from '../treasury/redemption';
+import { quoteRedemption, quoteRedemptionBatch } from '../treasury/redemption';
 
 const prisma = new PrismaClient();
 
@@ -11,6 +11,19 @@ const requestSchema = z.object({
   tokens: z.number().positive(),
 });
 
+const MAX_BATCH_REDEMPTIONS = 500;
+const MAX_BATCH_RETRIES = 3;
+
+const batchSchema = z.object({
+  redemptions: z.array(requestSchema).min(1).max(MAX_BATCH_REDEMPTIONS),
+});
+
+class TreasuryUninitializedError extends Error {
+  constructor() {
+    super('treasury_uninitialized');
+  }
+}
+
 export default async function redemptionRoutes(app: FastifyInstance) {
   app.post('/treasury/redeem', async (req, reply) => {
     const parseResult = requestSchema.safeParse(req.body);
@@ -100,4 +113,106 @@ export default async function redemptionRoutes(app: FastifyInstance) {
       return { ok: false, error: 'unknown_error' };
     }
   });
+
+  // Applies up to MAX_BATCH_REDEMPTIONS redemptions in one serializable transaction, so a
+  // queued batch from the gateway worker costs one round trip and concurrent batches cannot
+  // both spend the same treasury snapshot. Each entry is quoted against the balances left by
+  // the ones before it and gets its own ok/error result, in request order.
+  app.post('/treasury/redeem/batch', async (req, reply) => {
+    const parseResult = batchSchema.safeParse(req.body);
+    if (!parseResult.success) {
+      reply.status(400);
+      return { ok: false, error: 'invalid_payload', detail: parseResult.error.flatten() };
+    }
+
+    const alpha = Number(process.env.TREASURY_POLICY_ALPHA ?? 0.75);
+    const spread = Number(process.env.TREASURY_POLICY_SPREAD_BPS ?? 50);
+
+    for (let attempt = 1; ; attempt += 1) {
+      try {
+        const results = await prisma.$transaction(
+          async (tx) => {
+            const [treasury, supply] = await Promise.all([
+              tx.treasuryState.findFirst({ orderBy: { createdAt: 'desc' } }),
+              tx.tokenSupply.findFirst({ where: { symbol: 'HRVST' } }),
+            ]);
+            if (!treasury || !supply) {
+              throw new TreasuryUninitializedError();
+            }
+
+            const batch = quoteRedemptionBatch(
+              parseResult.data.redemptions,
+              { circulating: Number(supply.circulating), stableUsd: Number(treasury.stableUsd) },
+              (balances) =>
+                computeNav({
+                  treasuryStableUsd: balances.stableUsd,
+                  insuredReservesUsd: Number(treasury.insuredReservesUsd),
+                  realizedYieldUsd: Number(treasury.realizedYieldUsd),
+                  liabilitiesUsd: Number(treasury.liabilitiesUsd),
+                  supply: balances.circulating,
+                  alphaFloor: alpha,
+                  spreadBps: spread,
+                }),
+            );
+
+            const responses = [];
+            for (const result of batch.results) {
+              if (!result.ok) {
+                responses.push({ ok: false, error: result.error });
+                continue;
+              }
+              const { quote } = result;
+              const ticket = await tx.redemptionTicket.create({
+                data: {
+                  holderId: quote.holderId,
+                  tokens: new Prisma.Decimal(quote.tokens),
+                  usdPaid: new Prisma.Decimal(quote.usdOwed),
+                  pricePerToken: new Prisma.Decimal(quote.pricePerToken),
+                },
+              });
+              responses.push({
+                ok: true,
+                ticket: { id: ticket.id, holderId: ticket.holderId },
+                usdOwed: quote.usdOwed,
+                price: quote.pricePerToken,
+                navPerToken: quote.navPerToken,
+              });
+            }
+
+            if (responses.some((response) => response.ok)) {
+              await tx.tokenSupply.update({
+                where: { symbol: 'HRVST' },
+                data: { circulating: new Prisma.Decimal(batch.balances.circulating) },
+              });
+              await tx.treasuryState.create({
+                data: {
+                  stableUsd: new Prisma.Decimal(batch.balances.stableUsd),
+                  insuredReservesUsd: treasury.insuredReservesUsd,
+                  realizedYieldUsd: treasury.realizedYieldUsd,
+                  liabilitiesUsd: treasury.liabilitiesUsd,
+                },
+              });
+            }
+            return responses;
+          },
+          { isolationLevel: Prisma.TransactionIsolationLevel.Serializable },
+        );
+        return { ok: true, results };
+      } catch (err) {
+        if (err instanceof TreasuryUninitializedError) {
+          reply.status(400);
+          return { ok: false, error: err.message };
+        }
+        // P2034: the serializable transaction lost a write conflict; nothing was committed.
+        if (
+          err instanceof Prisma.PrismaClientKnownRequestError &&
+          err.code === 'P2034' &&
+          attempt < MAX_BATCH_RETRIES
+        ) {
+          continue;
+        }
+        throw err;
+      }
+    }
+  });
 }
@@ -66,6 +66,54 @@ export function quoteRedemption(ctx: RedemptionContext): RedemptionQuote {
   };
 }
 
+export interface TreasuryBalances {
+  circulating: number;
+  stableUsd: number;
+}
+
+export interface RedemptionRequest {
+  holderId: string;
+  tokens: number;
+}
+
+export type BatchRedemptionResult =
+  | { ok: true; quote: RedemptionQuote }
+  | { ok: false; error: string };
+
+/**
+ * Quote redemptions in order against running balances, as if each were submitted on its own:
+ * every accepted quote draws down supply and stable reserves before the next is priced, and a
+ * rejected request leaves the balances untouched.
+ */
+export function quoteRedemptionBatch(
+  requests: RedemptionRequest[],
+  balances: TreasuryBalances,
+  navFor: (balances: TreasuryBalances) => NavResult,
+  policy?: RedemptionPolicy,
+): { results: BatchRedemptionResult[]; balances: TreasuryBalances } {
+  let current = { ...balances };
+  const results: BatchRedemptionResult[] = requests.map(({ holderId, tokens }) => {
+    try {
+      const quote = quoteRedemption({
+        holderId,
+        tokensRequested: tokens,
+        availableSupply: current.circulating,
+        stableUsd: current.stableUsd,
+        nav: navFor(current),
+        policy,
+      });
+      current = {
+        circulating: current.circulating - quote.tokens,
+        stableUsd: Math.max(0, current.stableUsd - quote.usdOwed),
+      };
+      return { ok: true, quote };
+    } catch (err) {
+      return { ok: false, error: err instanceof Error ? err.message : 'unknown_error' };
+    }
+  });
+  return { results, balances: current };
+}
+
 function round(value: number): number {
   return Math.round((value + Number.EPSILON) * 100) / 100;
 }
@@ -1,5 +1,5 @@
 import { describe, expect, it } from 'vitest';
-import { quoteRedemption } from '../src/treasury/redemption.ts';
+import { quoteRedemption, quoteRedemptionBatch } from '../src/treasury/redemption.ts';
 
 const nav = {
   navPerToken: 1.05,
@@ -45,4 +45,21 @@ describe('quoteRedemption', () => {
       }),
     ).toThrowError('exceeds_policy_percent_cap');
   });
+
+  it('quotes a batch against the balances left by earlier entries', () => {
+    const { results, balances } = quoteRedemptionBatch(
+      [
+        { holderId: 'ALPHA-001', tokens: 6_000 },
+        { holderId: 'ALPHA-002', tokens: 6_000 },
+        { holderId: 'ALPHA-003', tokens: 1_000 },
+      ],
+      { circulating: 10_000, stableUsd: 100_000 },
+      () => nav,
+    );
+
+    expect(results.map((result) => result.ok)).toEqual([true, false, true]);
+    expect(results[1]).toEqual({ ok: false, error: 'insufficient_supply' });
+    expect(balances.circulating).toBe(3_000);
+    expect(balances.stableUsd).toBeCloseTo(100_000 - 7_000 * nav.price);
+  });
 });